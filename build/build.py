@@ -20,8 +20,12 @@ ASSET_DIRS = (
 )
 
 SRC_FILES = (
+    "catalog.py",
     "code.py",
-    "zipfile.py",
+    "httpfile.py",
+    "jsonfields.py",
+    "rawimage.py",
+    "zipreader.py",
     "icon.bmp",
     "metadata.json"
 )
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import struct
+
+# Constants
+SEEK_SET = 0
+MAGIC = b"FJLC"
+VERSION = 2
+
+# Catalog structures (written by database/build.py)
+#
+# header:   magic, version, category count
+# category: name length, entry count, offset of offset table, followed by name
+# table:    record offset for each entry of a category
+# record:   release asset id, release asset size, icon atlas tile, length of each
+#           string field, followed by the utf-8 encoded string fields
+HEADER_STRUCT = "<4sBB"
+HEADER_SIZE = struct.calcsize(HEADER_STRUCT)
+CATEGORY_STRUCT = "<BHL"
+CATEGORY_SIZE = struct.calcsize(CATEGORY_STRUCT)
+OFFSET_STRUCT = "<L"
+OFFSET_SIZE = struct.calcsize(OFFSET_STRUCT)
+RECORD_STRUCT = "<2L9H"
+RECORD_SIZE = struct.calcsize(RECORD_STRUCT)
+RECORD_FIELDS = ("full_name", "title", "author", "description", "default_branch", "icon", "tag", "url")
+
+
+class BadCatalog(ValueError):
+    pass
+
+
+class CatalogCategory:
+    """Sequence of the application names within a category. Records are read
+    from the catalog file when accessed rather than being kept in memory."""
+
+    def __init__(self, catalog, name: str, count: int, offset: int):
+        self._catalog = catalog
+        self.name = name
+        self._count = count
+        self._offset = offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> str:
+        return self._catalog._read_record(self._record_offset(index), 1)["full_name"]
+
+    def _record_offset(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Catalog index out of range")
+        file_obj = self._catalog.file_obj
+        file_obj.seek(self._offset + index * OFFSET_SIZE, SEEK_SET)
+        return struct.unpack(OFFSET_STRUCT, file_obj.read(OFFSET_SIZE))[0]
+
+    def details(self, index: int) -> dict:
+        return self._catalog._read_record(self._record_offset(index))
+
+
+class Catalog:
+    """Read-only mapping of category names to CatalogCategory sequences over a
+    paged binary catalog file. Only the category table is kept in memory."""
+
+    def __init__(self, file_obj):
+        self.file_obj = file_obj
+        file_obj.seek(0, SEEK_SET)
+        data = file_obj.read(HEADER_SIZE)
+        if len(data) != HEADER_SIZE:
+            raise BadCatalog("Unexpected end of catalog")
+        magic, version, count = struct.unpack(HEADER_STRUCT, data)
+        if magic != MAGIC:
+            raise BadCatalog("Invalid catalog signature")
+        if version != VERSION:
+            raise BadCatalog("Unsupported catalog version {:d}".format(version))
+
+        self._categories = {}
+        self._names = []
+        for i in range(count):
+            name_len, entry_count, offset = struct.unpack(CATEGORY_STRUCT, file_obj.read(CATEGORY_SIZE))
+            name = str(file_obj.read(name_len), "utf-8")
+            self._categories[name] = CatalogCategory(self, name, entry_count, offset)
+            self._names.append(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self.file_obj.close()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._categories
+
+    def __getitem__(self, name: str) -> CatalogCategory:
+        return self._categories[name]
+
+    def keys(self) -> list:
+        return self._names
+
+    def values(self) -> list:
+        return list(map(lambda name: self._categories[name], self._names))
+
+    def items(self) -> list:
+        return list(map(lambda name: (name, self._categories[name]), self._names))
+
+    def _read_record(self, offset: int, fields: int = len(RECORD_FIELDS)) -> dict:
+        self.file_obj.seek(offset, SEEK_SET)
+        header = struct.unpack(RECORD_STRUCT, self.file_obj.read(RECORD_SIZE))
+        asset_id, asset_size, icon_index = header[:3]
+        lengths = header[3:]
+
+        # only read as many string fields as requested
+        data = self.file_obj.read(sum(lengths[:fields]))
+        details = {}
+        pos = 0
+        for i in range(fields):
+            details[RECORD_FIELDS[i]] = str(data[pos:pos + lengths[i]], "utf-8")
+            pos += lengths[i]
+        if fields < len(RECORD_FIELDS):
+            return details
+
+        # empty fields are absent
+        for key in ("title", "icon"):
+            if not details[key]:
+                details[key] = None
+        details["icon_index"] = icon_index
+        tag, url = details.pop("tag"), details.pop("url")
+        details["release"] = {
+            "tag": tag,
+            "asset_id": asset_id,
+            "url": url,
+            "size": asset_size,
+        } if url else None
+        return details
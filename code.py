@@ -15,6 +15,7 @@ if len(__file__.split("/")[:-1]) > 1:
         sys.path.append(lib_path)
 
 import atexit
+import board
 import displayio
 import gc
 import math
@@ -24,21 +25,31 @@ import supervisor
 from terminalio import FONT
 import time
 import json
+import rtc
+from binascii import crc32
+from collections import OrderedDict
+from digitalio import DigitalInOut
 
 from adafruit_anchored_group import AnchoredGroup
 from adafruit_anchored_tilegrid import AnchoredTileGrid
 from adafruit_button import Button
+import adafruit_connection_manager
 from adafruit_display_text.label import Label
 from adafruit_display_text.text_box import TextBox
 from adafruit_displayio_layout.layouts.grid_layout import GridLayout
+from adafruit_esp32spi import adafruit_esp32spi
 import adafruit_fruitjam
-import adafruit_fruitjam.network
 import adafruit_fruitjam.peripherals
 import adafruit_imageload
+import adafruit_requests
 from adafruit_portalbase.network import HttpError
 import adafruit_usb_host_mouse
 
-from zipfile import ZipFile
+from catalog import Catalog
+from httpfile import HTTPRangeFile, HTTPStream, RangeNotSupported, close_response, fetch_all
+import jsonfields
+import rawimage
+from zipreader import BadZipFile, ZipFile, ZipStream
 
 try:
     import typing
@@ -47,10 +58,47 @@ except ImportError:
 
 # program constants
 APPLICATIONS_URL = "https://raw.githubusercontent.com/relic-se/Fruit_Jam_Library/refs/heads/main/database/applications.json"
+CATALOG_URL = "https://raw.githubusercontent.com/relic-se/Fruit_Jam_Library/refs/heads/main/database/catalog.bin"
 METADATA_URL = "https://raw.githubusercontent.com/{:s}/refs/heads/main/metadata.json"
 REPO_URL = "https://api.github.com/repos/{:s}"
 ICON_URL = "https://raw.githubusercontent.com/{:s}/{:s}/{:s}"
+ICONS_URL = "https://raw.githubusercontent.com/relic-se/Fruit_Jam_Library/refs/heads/main/database/icons.bmp"
+ICON_SIZE = 64
 RELEASE_URL = "https://api.github.com/repos/{:s}/releases/latest"
+API_URL = "https://api.github.com/"  # requests to the api are rate limited (60 per hour without authentication)
+
+RELEASE_FILE = ".release.json"  # installed release details within each application directory
+UPDATES_PATH = "/sd/.cache/updates.json"  # latest known releases of installed applications
+
+CACHE_DIR = "/sd/.cache"
+CACHE_MANIFEST_PATH = CACHE_DIR + "/manifest.json"  # url, size, access order and validators of cached files
+CACHE_RESERVED = ("manifest.json", "updates.json")  # files within the cache directory which aren't cache entries
+CACHE_SIZE_LIMIT = os.getenv("LIBRARY_CACHE_SIZE", 4 * 1024 * 1024)  # bytes
+CACHE_TRANSIENT = ("release",)  # kinds of entries which are evicted first
+CACHE_PERSISTENT = ("catalog",)  # kinds of entries which are never evicted, the catalog is kept open while running
+CACHE_TTL = {  # seconds before a cached file is revalidated
+    "default": 24 * 60 * 60,
+    "catalog": 60 * 60,
+    "repository": 24 * 60 * 60,
+    "metadata": 24 * 60 * 60,
+    "icon": 7 * 24 * 60 * 60,
+    "release": 60 * 60,
+}
+CACHE_SAVE_INTERVAL = 30  # seconds between saving the access order of cache hits
+JSON_FIELDS = {  # fields of api responses which are read, the rest isn't parsed or cached
+    "repository": {"owner": {"login": True}, "description": True, "default_branch": True},
+    "release": {"tag_name": True, "assets": [{"id": True, "name": True, "browser_download_url": True}]},
+}
+DOWNLOAD_CHUNK_SIZE = 4096
+DOWNLOAD_RESUME_ATTEMPTS = 3  # times an interrupted download is resumed before giving up
+PROGRESS_INTERVAL = 1  # seconds between download progress updates in the status bar
+ICON_CACHE_MEM_FREE = os.getenv("LIBRARY_ICON_CACHE_MEM_FREE", 256 * 1024)  # bytes of free memory kept while caching icons
+PREFETCH_REQUESTS = os.getenv("LIBRARY_PREFETCH_REQUESTS", 24)  # requests per session which may be used to prefetch pages
+RATE_LIMIT_RESERVE = os.getenv("LIBRARY_RATE_LIMIT_RESERVE", 10)  # api requests which background tasks leave for visible items
+HTTP_MONTHS = "JanFebMarAprMayJunJulAugSepOctNovDec"
+
+EXTRACT_CHUNK_SIZE = 4096
+VERSION_DIR = "CircuitPython {:d}.x".format(int(os.uname().release.split(".")[0]))  # bundle directory for this version
 
 # file operations
 
@@ -81,58 +129,717 @@ def rmtree(dirpath: str) -> None:
             rmtree(filepath)
     os.rmdir(dirpath)
 
-def extractall(zf: ZipFile, destination: str, source: str = "") -> None:
+def plan_extraction(zf: ZipFile, source: str = "") -> tuple:
+    # index files by their parent directory
+    index = {}
     for srcpath in zf:
-        if srcpath.startswith(source + "/"):
-            destpath = destination + "/" + srcpath[len(source) + 1:]
-            mkdir(destpath, True)
-            with open(destpath, "wb") as f:
-                f.write(zf.read(zf[srcpath]))
+        if srcpath.endswith("/"):
+            continue
+        dirname = srcpath.rsplit("/", 1)[0] if "/" in srcpath else ""
+        if dirname in index:
+            index[dirname].append(srcpath)
+        else:
+            index[dirname] = [srcpath]
+
+    # collect directories and files below source
+    prefix = source + "/" if source else ""
+    dirs = set()
+    members = []
+    for dirname, srcpaths in index.items():
+        if dirname != source and not dirname.startswith(prefix):
+            continue
+        dirname = dirname[len(prefix):] if dirname != source else ""
+        while dirname and dirname not in dirs:
+            dirs.add(dirname)
+            dirname = dirname.rsplit("/", 1)[0] if "/" in dirname else ""
+        for srcpath in srcpaths:
+            members.append((zf[srcpath], srcpath[len(prefix):]))
+
+    # create parents first and read members in archive order for sequential access
+    dirs = sorted(dirs)
+    members.sort(key=lambda member: member[0].offset)
+    return dirs, members
+
+def file_matches(path: str, size: int, crc: int, buf: bytearray) -> bool:
+    try:
+        if os.stat(path)[6] != size:
+            return False
+    except OSError:
+        return False
+    value = 0
+    view = memoryview(buf)
+    with open(path, "rb") as f:
+        while chunk_size := f.readinto(buf):
+            value = crc32(view[:chunk_size], value)
+    return value == crc
+
+def prune(dirpath: str, keep: set, prefix: str = "") -> int:
+    # remove files which aren't in keep and any directories left empty
+    removed = 0
+    for name in os.listdir(dirpath):
+        filepath = dirpath + "/" + name
+        if os.stat(filepath)[0] & 0x4000:
+            removed += prune(filepath, keep, prefix + name + "/")
+            if not os.listdir(filepath):
+                os.rmdir(filepath)
+        elif prefix + name not in keep:
+            os.remove(filepath)
+            removed += 1
+    return removed
+
+# extraction yields after each file so that other work can be done in between, the result is returned
+
+def extractall(zf: ZipFile, destination: str, source: str = "", update: bool = False) -> typing.Generator:
+    dirs, members = plan_extraction(zf, source)
+
+    mkdir(destination)
+    for dirname in dirs:
+        try:
+            os.mkdir(destination + "/" + dirname)
+        except OSError:  # already exists
+            pass
+
+    buf = bytearray(EXTRACT_CHUNK_SIZE)  # reused for every file
+    written = 0
+    total = 0
+    for zip_info, destpath in members:
+        total += zip_info.size
+        destpath = destination + "/" + destpath
+        if update and file_matches(destpath, zip_info.size, zip_info.crc32, buf):
+            continue
+        with open(destpath, "wb") as f:
+            zf.extract_to(zip_info, f, buf)
+        written += 1
+        yield
+    return set(map(lambda member: member[1], members)), written, total
+
+def extractstream(zs: ZipStream, destination: str, sources: tuple, update: bool = False) -> typing.Generator:
+    # sources are directories in order of preference, only the most preferred one within the archive is
+    # extracted (like the directory of code.py in a central directory) which isn't known until it's seen
+    buf = bytearray(EXTRACT_CHUNK_SIZE)  # reused for every file
+    source = None
+    rank = len(sources)
+    paths = set()
+    dirs = []  # directories created for the current source
+    written = 0
+    total = 0
+    for member in zs:
+        srcpath = member.zip_info.name
+        if srcpath.endswith("/"):
+            continue
+
+        # files for other CircuitPython versions are never extracted rather than being replaced later
+        if any(map(lambda name: name.startswith("CircuitPython ") and name != VERSION_DIR, srcpath.split("/")[:-1])):
+            continue
+
+        # find the most preferred source containing this file, skip any other files
+        for i, dirpath in enumerate(sources):
+            if not dirpath or srcpath.startswith(dirpath + "/"):
+                break
+        else:
+            continue
+        if i > rank:
+            continue
+        if i < rank:
+            # discard files and directories extracted from a less preferred source
+            for path in paths:
+                try:
+                    os.remove(destination + "/" + path)
+                except OSError:
+                    pass
+            for path in reversed(dirs):
+                try:
+                    os.rmdir(path)
+                except OSError:  # not empty
+                    pass
+            source, rank = dirpath, i
+            paths = set()
+            dirs = []
+            written = 0
+            total = 0
+
+        destpath = srcpath[len(source) + 1:] if source else srcpath
+        paths.add(destpath)
+        destpath = destination + "/" + destpath
+        if update and not member.zip_info.streamed and file_matches(destpath, member.zip_info.size, member.zip_info.crc32, buf):
+            total += member.zip_info.size
+            continue
+        dirpath = destpath[:destpath.rfind("/")]
+        created = []
+        while len(dirpath) > len(destination) and not exists(dirpath):
+            created.append(dirpath)
+            dirpath = dirpath[:dirpath.rfind("/")]
+        dirs.extend(reversed(created))
+        mkdir(destpath, True)
+        with open(destpath, "wb") as f:
+            view = memoryview(buf)
+            while size := member.readinto(buf):
+                f.write(view[:size])
+                total += size
+        written += 1
+        yield
+    return paths, written, total
+
+# installed applications, listed once at startup and kept up to date by install and remove
+
+installed_apps = {}  # name to release info, or None if it hasn't been read yet
+def load_installed_apps() -> None:
+    installed_apps.clear()
+    for name in os.listdir("/sd/apps"):
+        installed_apps[name] = None
 
 def is_app_installed(name: str) -> bool:
-    return exists("/sd/apps/{:s}".format(name))
+    return name in installed_apps
+
+def remove_installed_app(name: str) -> None:
+    installed_apps.pop(name, None)
+
+# release tracking
+
+def read_installed_release(name: str) -> dict|None:
+    if name not in installed_apps:
+        return None
+    if installed_apps[name] is None:
+        try:
+            with open("/sd/apps/{:s}/{:s}".format(name, RELEASE_FILE), "r") as f:
+                installed_apps[name] = json.load(f)
+        except (OSError, ValueError):
+            installed_apps[name] = {}  # installed without release info
+    return installed_apps[name] if "tag" in installed_apps[name] else None
+
+def write_installed_release(name: str, release: dict, size: int) -> None:
+    info = {
+        "tag": release["tag"],
+        "asset_id": release["asset_id"],
+        "size": size,
+        "time": time.time(),
+    }
+    # only registered once written, a failed install is removed and a failed update keeps the previous release
+    with open("/sd/apps/{:s}/{:s}".format(name, RELEASE_FILE), "w") as f:
+        json.dump(info, f)
+    installed_apps[name] = info
+
+latest_releases = {}
+def is_update_available(full_name: str) -> bool:
+    installed = read_installed_release(full_name.split("/")[1])
+    latest = latest_releases.get(full_name)
+    return installed is not None and latest is not None and installed["asset_id"] != latest["asset_id"]
+
+def read_catalog_releases(full_names: list) -> dict:
+    # latest releases listed by the catalog as of its last build, None if an application had none
+    releases = {}
+    if isinstance(applications, Catalog):
+        full_names = set(full_names)
+        for category in applications.values():
+            for index in range(len(category)):
+                if (full_name := category[index]) in full_names and full_name not in releases:
+                    releases[full_name] = category.details(index)["release"]
+    return releases
+
+def check_updates(full_names: list) -> int:
+    changed = False
+    full_names = list(filter(lambda full_name: read_installed_release(full_name.split("/")[1]) is not None, full_names))
+
+    # the catalog is rebuilt daily with the latest release of every application, so only applications
+    # missing from it are checked with the API
+    releases = read_catalog_releases(full_names)
+    for full_name in full_names:
+        if full_name in releases:
+            release = releases[full_name]
+            if release is not None and latest_releases.get(full_name, {}).get("asset_id") != release["asset_id"]:
+                latest_releases[full_name] = {
+                    "tag": release["tag"],
+                    "asset_id": release["asset_id"],
+                }
+                changed = True
+            continue
+
+        # unchanged releases cost a 304 without a body, but unauthenticated requests still count against the rate limit
+        log("Checking for updates to {:s}".format(full_name))
+        latest = latest_releases.get(full_name)
+        headers = {"Accept": "application/vnd.github+json"}
+        if latest is not None and latest.get("etag"):
+            headers["If-None-Match"] = latest["etag"]
+        if not use_api(RELEASE_URL.format(full_name), background=True):
+            log("Postponing update checks until the API rate limit resets")
+            break
+        try:
+            response = http_get(RELEASE_URL.format(full_name), headers=headers)
+        except (OSError, RuntimeError) as e:
+            # don't wait on every remaining application while offline
+            log("Unable to check for updates! {:s}".format(str(e)))
+            break
+        try:
+            if response.status_code == 200:
+                release = jsonfields.load(HTTPStream(response), JSON_FIELDS["release"])
+                asset = list(filter(lambda x: x["name"].endswith(".zip"), release["assets"]))[0]
+                latest_releases[full_name] = {
+                    "etag": response.headers.get("etag"),
+                    "tag": release["tag_name"],
+                    "asset_id": asset["id"],
+                }
+                changed = True
+            elif response.status_code != 304:
+                log("Unable to check for updates to {:s}! Code {:d}".format(full_name, response.status_code))
+        except (OSError, ValueError, IndexError, KeyError, RuntimeError) as e:
+            log("Unable to check for updates to {:s}! {:s}".format(full_name, str(e)))
+        finally:
+            close_response(response)
+        gc.collect()
+
+    if changed:
+        with open(UPDATES_PATH, "w") as f:
+            json.dump(latest_releases, f)
+    return len(list(filter(is_update_available, full_names)))
 
 # file download + caching
 
-def _download_file(url: str, extension: str, name: str|None = None) -> str:
+def get_requests() -> "adafruit_requests.Session":
+    fj.network.connect()
+    return http_session
+
+def http_get(url: str, headers: dict = None, stream: bool = False, timeout: int = 10) -> "adafruit_requests.Response":
+    # connections are kept alive in the session's pool (one per host) as long as responses are
+    # closed with close_response, retry once if the server has since closed a pooled connection
+    try:
+        response = get_requests().get(url, headers=headers, stream=stream, timeout=timeout)
+    except RuntimeError:
+        response = get_requests().get(url, headers=headers, stream=stream, timeout=timeout)
+    track_response(url, response)
+    return response
+
+# GitHub api rate limit as reported by the latest response, reset is in epoch seconds
+rate_limit = {"remaining": None, "reset": 0}
+
+def track_response(url: str, response: "adafruit_requests.Response") -> None:
+    sync_clock(response.headers.get("date"))
+    if url.startswith(API_URL) and "x-ratelimit-remaining" in response.headers:
+        try:
+            rate_limit["remaining"] = int(response.headers["x-ratelimit-remaining"])
+            rate_limit["reset"] = int(response.headers.get("x-ratelimit-reset", 0))
+        except ValueError:
+            pass
+
+def use_api(url: str, background: bool = False) -> bool:
+    # claim a request from the remaining rate limit, background requests leave a reserve for visible items
+    if not url.startswith(API_URL):
+        return True
+    if rate_limit["remaining"] is None or time.time() >= rate_limit["reset"]:
+        rate_limit["remaining"] = None
+        return True
+    if rate_limit["remaining"] <= (RATE_LIMIT_RESERVE if background else 0):
+        return False
+    rate_limit["remaining"] -= 1
+    return True
+
+# HTTP dates are used to set the clock if it hasn't been synced (it's lost on every power cycle)
+def sync_clock(date: str|None) -> None:
+    if date is None or time.localtime().tm_year >= 2025:
+        return
+    try:
+        # ie: "Wed, 21 Oct 2015 07:28:00 GMT"
+        weekday, day, month, year, hms, zone = date.split(" ")
+        hour, minute, second = map(int, hms.split(":"))
+        rtc.RTC().datetime = time.struct_time((
+            int(year), HTTP_MONTHS.index(month) // 3 + 1, int(day),
+            hour, minute, second, 0, -1, -1
+        ))
+    except (ValueError, OSError):
+        pass
+
+# cache store, files are named by URL hash and tracked in a single manifest
+
+cache_manifest = {"tick": 0, "entries": {}}
+cache_manifest_touched = None  # time of the first cache hit which hasn't been saved yet
+
+def save_cache_manifest() -> None:
+    global cache_manifest_touched
+    with open(CACHE_MANIFEST_PATH, "w") as f:
+        json.dump(cache_manifest, f)
+    cache_manifest_touched = None
+
+def touch_cache_entry(entry: dict) -> None:
+    # record a cache hit for eviction, hits are saved in batches rather than writing the manifest each time
+    global cache_manifest_touched
+    cache_manifest["tick"] += 1
+    entry["access"] = cache_manifest["tick"]
+    if cache_manifest_touched is None:
+        cache_manifest_touched = time.monotonic()
+
+def flush_cache_manifest(force: bool = False) -> None:
+    if cache_manifest_touched is not None and (force or time.monotonic() - cache_manifest_touched >= CACHE_SAVE_INTERVAL):
+        try:
+            save_cache_manifest()
+        except OSError as e:
+            log("Unable to save cache manifest! {:s}".format(str(e)))
+
+def load_cache_manifest() -> None:
+    global cache_manifest
+    try:
+        with open(CACHE_MANIFEST_PATH, "r") as f:
+            cache_manifest = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    # reconcile with the actual cache contents once rather than checking on every lookup
+    entries = cache_manifest["entries"]
+    names = os.listdir(CACHE_DIR)
+    files = set()
+    for key in list(entries.keys()):
+        if entries[key]["file"] not in names:
+            del entries[key]
+            continue
+        files.add(entries[key]["file"])
+        if "derived" in entries[key]:
+            entries[key]["derived"] = list(filter(lambda name: name in names, entries[key]["derived"]))
+            files.update(entries[key]["derived"])
+    for name in names:
+        # keep interrupted downloads which can be resumed alongside their marker
+        if name.endswith(".part") and name + ".json" in names:
+            continue
+        if name.endswith(".part.json") and name[:-len(".json")] in names:
+            continue
+        if name not in files and name not in CACHE_RESERVED:
+            try:
+                os.remove(CACHE_DIR + "/" + name)
+            except OSError:
+                pass
+
+def remove_cache_files(entry: dict) -> None:
+    for name in [entry["file"]] + entry.get("derived", []):
+        try:
+            os.remove(CACHE_DIR + "/" + name)
+        except OSError:
+            pass
+
+def evict_cache(keep: str|None = None) -> None:
+    entries = cache_manifest["entries"]
+    total = sum(map(lambda entry: entry["size"], entries.values()))
+    if total <= CACHE_SIZE_LIMIT:
+        return
+
+    # evict transient entries first, then least recently used
+    for key in sorted(entries.keys(), key=lambda key: (entries[key]["kind"] not in CACHE_TRANSIENT, entries[key]["access"])):
+        if total <= CACHE_SIZE_LIMIT:
+            break
+        if key == keep or entries[key]["kind"] in CACHE_PERSISTENT:
+            continue
+        total -= entries[key]["size"]
+        remove_cache_files(entries[key])
+        del entries[key]
+
+def cache_key(url: str) -> str:
+    return "{:08x}".format(crc32(url.encode()))
+
+def cache_entry(url: str) -> dict|None:
+    entry = cache_manifest["entries"].get(cache_key(url))
+    return entry if entry is not None and entry["url"] == url else None
+
+def is_cache_fresh(entry: dict|None, kind: str = "default") -> bool:
+    return entry is not None and 0 <= time.time() - entry["time"] < CACHE_TTL.get(kind, CACHE_TTL["default"])
+
+def cached_path(url: str) -> str|None:
+    # get the cached file regardless of its age without making any requests
+    if (entry := cache_entry(url)) is None:
+        return None
+    touch_cache_entry(entry)
+    return CACHE_DIR + "/" + entry["file"]
+
+class Progress:
+    # reports the transfer rate and remaining time of a download in the status bar (or elsewhere)
+    def __init__(self, name: str, total: int = 0, done: int = 0, show: typing.Callable = None):
+        self.name = name
+        self.total = total
+        self.done = done
+        self.show = show
+        self._start = self._shown = time.monotonic()
+        self._start_done = done
+
+    def __call__(self, size: int) -> None:
+        self.done += size
+        now = time.monotonic()
+        if now - self._shown < PROGRESS_INTERVAL:
+            return
+        self._shown = now
+        rate = (self.done - self._start_done) / (now - self._start)
+        msg = "{:s} {:d}KB at {:.1f}KB/s".format(self.name, self.done // 1024, rate / 1024)
+        if self.total and rate:
+            msg += ", {:d}% {:d}s left".format(
+                min(self.done * 100 // self.total, 100), max(int((self.total - self.done) / rate), 0)
+            )
+        (self.show or log)(msg)
+
+# interrupted downloads are kept as a .part file with a marker of the expected length and validator
+
+def read_part_marker(path: str) -> dict|None:
+    try:
+        with open(path + ".part.json", "r") as f:
+            marker = json.load(f)
+        marker["offset"] = os.stat(path + ".part")[6]
+    except (OSError, ValueError):
+        return None
+    return marker if 0 < marker["offset"] < marker["length"] else None
+
+def remove_part_files(path: str) -> None:
+    for name in (path + ".part", path + ".part.json"):
+        try:
+            os.remove(name)
+        except OSError:
+            pass
+
+def cache_headers(entry: dict|None) -> dict:
+    # revalidate expired file using stored validators
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("modified"):
+            headers["If-Modified-Since"] = entry["modified"]
+    return headers
+
+def store_response(url: str, extension: str, kind: str, response: "adafruit_requests.Response") -> str:
+    # write the response of a (conditional) request to the cache and close it
+    key = cache_key(url)
+    path = CACHE_DIR + "/" + key + extension
+    entries = cache_manifest["entries"]
+    entry = cache_entry(url)
+
+    derived = []
+    if response.status_code == 304 and entry is not None:
+        close_response(response)
+        size = entry["size"]
+        derived = entry.get("derived", [])
+    elif response.status_code in (200, 206):
+        # write to a partial file so that the previous file remains intact if the download fails
+        size = 0
+        length = int(response.headers.get("content-length", 0))
+        marker = read_part_marker(path) if response.status_code == 206 else None
+        if response.status_code == 206:
+            # continue an interrupted download
+            content_range = response.headers.get("content-range", "")
+            if marker is None or content_range != "bytes {:d}-{:d}/{:d}".format(marker["offset"], marker["length"] - 1, marker["length"]):
+                close_response(response)
+                remove_part_files(path)
+                raise OSError("Unexpected range {:s}".format(content_range))
+            size, length = marker["offset"], marker["length"]
+        else:
+            remove_part_files(path)
+            validator = response.headers.get("etag") or response.headers.get("last-modified")
+            if kind not in JSON_FIELDS and length and validator:
+                marker = {"url": url, "length": length, "validator": validator}
+                with open(path + ".part.json", "w") as f:
+                    json.dump(marker, f)
+        try:
+            if kind in JSON_FIELDS:
+                # only keep the fields we use rather than the entire document
+                with HTTPStream(response) as stream:
+                    data = json.dumps(jsonfields.load(stream, JSON_FIELDS[kind]))
+                with open(path + ".part", "w") as f:
+                    size = f.write(data)
+            else:
+                progress = Progress(url.split("/")[-1], length, size)
+                with open(path + ".part", "ab" if size else "wb") as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+                        progress(len(chunk))
+                if marker is not None and size != length:
+                    raise OSError("Incomplete download, {:d} of {:d} bytes".format(size, length))
+        except (OSError, RuntimeError, ValueError) as e:
+            # keep what was received if the download can be resumed
+            if marker is None or size > length:
+                remove_part_files(path)
+            raise OSError(str(e))
+        finally:
+            close_response(response)
+
+        # replace previous file and any files generated from it, the file of a persistent entry is kept
+        # aside until the caller has opened the new one
+        if key in entries:
+            previous = entries.pop(key)
+            if kind in CACHE_PERSISTENT and exists(CACHE_DIR + "/" + previous["file"]):
+                os.rename(CACHE_DIR + "/" + previous["file"], path + ".old")
+            remove_cache_files(previous)
+        os.rename(path + ".part", path)
+        remove_part_files(path)
+    else:
+        close_response(response)
+        raise HttpError("Code {:d}: {:s}".format(response.status_code, str(response.reason, "utf-8")), response)
+
+    cache_manifest["tick"] += 1
+    entries[key] = {
+        "url": url,
+        "file": key + extension,
+        "kind": kind,
+        "size": size,
+        "time": time.time(),
+        "access": cache_manifest["tick"],
+        "etag": response.headers.get("etag"),
+        "modified": response.headers.get("last-modified"),
+    }
+    if response.status_code == 304:
+        # a 304 doesn't have to repeat the validators of the cached file
+        for field in ("etag", "modified"):
+            if entries[key][field] is None:
+                entries[key][field] = entry.get(field)
+    if derived:
+        entries[key]["derived"] = derived
+    evict_cache(key)
+    save_cache_manifest()
+    return path
+
+def _download_file(url: str, extension: str, kind: str = "default", force: bool = False, background: bool = False, claimed: bool = False) -> str:
     if not extension.startswith("."):
         extension = "." + extension
 
-    if name is None:
-        name = url.split("/")[-1][:-len(extension)]
-    elif name.endswith(extension):
-        name = name[:-len(extension)]
-    path = "/sd/.cache/{:s}{:s}".format(name, extension)
+    path = CACHE_DIR + "/" + cache_key(url) + extension
+    entry = cache_entry(url)  # None on hash collision, entry is replaced
 
-    # download file if it doesn't already exist
-    if not exists(path):
-        fj.network.wget(url, path)
-    # TODO: Cache duration
-    return path
+    # use cached file until it expires
+    if entry is not None:
+        touch_cache_entry(entry)
+        if not force and is_cache_fresh(entry, kind):
+            return path
+
+    # serve stale data rather than exceeding the rate limit, unless the caller has already claimed this request
+    if not claimed and not use_api(url, background):
+        if entry is not None:
+            return path
+        raise OSError("API rate limit exceeded")
+
+    attempts = 0
+    while True:
+        # resume an interrupted download if the remote file hasn't changed since
+        headers = cache_headers(entry)
+        if (marker := read_part_marker(path)) is not None and marker["url"] == url:
+            headers["Range"] = "bytes={:d}-".format(marker["offset"])
+            headers["If-Range"] = marker["validator"]
+
+        try:
+            response = http_get(url, headers=headers, stream=True)
+        except (OSError, RuntimeError) as e:
+            if entry is not None:  # serve stale data while offline
+                return path
+            raise OSError(str(e))
 
-def download_image(url: str, name: str|None = None) -> str:
+        try:
+            return store_response(url, extension, kind, response)
+        except OSError:
+            attempts += 1
+            if attempts > DOWNLOAD_RESUME_ATTEMPTS or read_part_marker(path) is None:
+                raise
+
+def fetch_files(files: list) -> typing.Generator:
+    # download several expired files at once, yielding between requests and the index of each
+    # file once it has been cached, failed files are left to be requested individually
+    requests = []
+    for url, extension, kind in files:
+        requests.append((url, cache_headers(cache_entry(url))))
+    try:
+        fetcher = fetch_all(get_requests(), requests)
+    except (OSError, RuntimeError) as e:
+        log("Unable to connect! {:s}".format(str(e)))
+        return
+    try:
+        for result in fetcher:
+            if result is None:
+                yield None
+                continue
+            index, response = result
+            if response is not None:
+                url, extension, kind = files[index]
+                track_response(url, response)
+                try:
+                    store_response(url, extension, kind, response)
+                except (OSError, HttpError) as e:
+                    log("Unable to download {:s}! {:s}".format(url, str(e)))
+            yield index
+    finally:
+        # abandoned generators aren't finalized on the device, so the connections of unread responses
+        # are only released if the fetcher is closed along with us
+        fetcher.close()
+
+def download_image(url: str, kind: str = "icon", force: bool = False) -> str:
     return _download_file(
         url=url,
         extension=".bmp",
-        name=name,
+        kind=kind,
+        force=force,
     )
 
-def download_json(url: str, name: str|None = None) -> str:
+def download_json(url: str, kind: str = "default", force: bool = False, claimed: bool = False) -> str:
     path = _download_file(
         url=url,
         extension=".json",
-        name=name,
+        kind=kind,
+        force=force,
+        claimed=claimed,
     )
+    # files cached before their fields were selected are trimmed while reading
+    if kind in JSON_FIELDS:
+        with open(path, "rb") as f:
+            return jsonfields.load(f, JSON_FIELDS[kind])
     with open(path, "r") as f:
-        data = json.loads(f.read())
-    return data
+        return json.load(f)
 
-def download_zip(url: str, name: str|None = None) -> str:
-    return _download_file(
-        url=url,
-        extension=".zip",
-        name=name,
-    )
+# files generated from a cached download are tracked by its manifest entry and removed alongside it
+
+def derived_cache_path(path: str, extension: str) -> tuple:
+    name = path.split("/")[-1].split(".")[0] + extension
+    entry = cache_manifest["entries"].get(name.split(".")[0])
+    return CACHE_DIR + "/" + name, entry is not None and name in entry.get("derived", [])
+
+def add_derived_cache_file(path: str) -> None:
+    name = path.split("/")[-1]
+    entry = cache_manifest["entries"].get(name.split(".")[0])
+    if entry is None:
+        return
+    derived = entry.setdefault("derived", [])
+    if name not in derived:
+        derived.append(name)
+        entry["size"] += os.stat(path)[6]
+        save_cache_manifest()
+
+# images are transcoded once into a format which can be read directly into a Bitmap
+
+def load_image(url: str, offline: bool = False, force: bool = False) -> tuple:
+    path = cached_path(url) if offline else None
+    if path is None:
+        path = download_image(url, force=force)
+    raw_path, transcoded = derived_cache_path(path, ".raw")
+    if transcoded:
+        try:
+            return rawimage.load(raw_path)
+        except (OSError, ValueError) as e:
+            log("Unable to read transcoded image {:s}! {:s}".format(raw_path, str(e)))
+
+    image = adafruit_imageload.load(path)
+    try:
+        rawimage.save(raw_path, *image)
+    except OSError as e:
+        log("Unable to transcode image {:s}! {:s}".format(path, str(e)))
+    else:
+        add_derived_cache_file(raw_path)
+    return image
+
+# decoded icons, least recently used first
+
+icon_cache = OrderedDict()
+def load_icon(url: str) -> tuple:
+    if url in icon_cache:
+        icon = icon_cache.pop(url)
+        icon_cache[url] = icon
+        return icon
+
+    icon = load_image(url)
+    icon_cache[url] = icon
+
+    # icons which are currently displayed remain referenced by their TileGrid
+    gc.collect()
+    while len(icon_cache) > 1 and gc.mem_free() < ICON_CACHE_MEM_FREE:
+        icon_cache.pop(next(iter(icon_cache)))
+        gc.collect()
+    return icon
 
 # get Fruit Jam OS config if available
 try:
@@ -155,8 +862,17 @@ except ValueError:  # invalid user config or no user config provided
     adafruit_fruitjam.peripherals.request_display_config(720, 400)  # default display size
 display = supervisor.runtime.display
 
-# setup FruitJam peripherals and networking
-fj = adafruit_fruitjam.FruitJam()
+# setup FruitJam peripherals and networking, the radio is created here so that requests use our own session
+esp = adafruit_esp32spi.ESP_SPIcontrol(
+    board.SPI(),
+    DigitalInOut(board.ESP_CS),
+    DigitalInOut(board.ESP_BUSY),
+    DigitalInOut(board.ESP_RESET),
+)
+fj = adafruit_fruitjam.FruitJam(esp=esp)
+socket_pool = adafruit_connection_manager.get_radio_socketpool(esp)
+ssl_context = adafruit_connection_manager.get_radio_ssl_context(esp)
+http_session = adafruit_requests.Session(socket_pool, ssl_context)
 
 # load images
 default_icon_bmp, default_icon_palette = adafruit_imageload.load("bitmaps/default_icon.bmp")
@@ -167,6 +883,11 @@ installed_palette.make_transparent(1)
 installed_palette[0] = config.palette_bg if config is not None else 0x222222
 installed_palette[2] = config.palette_fg if config is not None else 0xffffff
 
+update_bmp, update_palette = adafruit_imageload.load("bitmaps/update.bmp")
+update_palette.make_transparent(1)
+update_palette[0] = config.palette_bg if config is not None else 0x222222
+update_palette[2] = config.palette_fg if config is not None else 0xffffff
+
 left_bmp, left_palette = adafruit_imageload.load("bitmaps/arrow_left.bmp")
 left_palette.make_transparent(0)
 right_bmp, right_palette = adafruit_imageload.load("bitmaps/arrow_right.bmp")
@@ -327,35 +1048,97 @@ if not fj.sd_check():
 for dirname in ("apps", ".cache"):
     mkdir("/sd/" + dirname)
 
-# download applications database
+# load cache manifest
+load_cache_manifest()
+
+# list installed applications
+load_installed_apps()
+
+# load latest known releases of installed applications
 try:
-    applications = json.loads(fj.fetch(
-        APPLICATIONS_URL,
-        force_content_type=adafruit_fruitjam.network.CONTENT_JSON,
-        timeout=10,
-    ))
-    if type(applications) is int:
-        raise ValueError("{:d} response".format(applications))
-except (OSError, ValueError, AttributeError) as e:
-    log("Unable to fetch applications database! {:s}".format(str(e)))
+    with open(UPDATES_PATH, "r") as f:
+        latest_releases = json.load(f)
+except (OSError, ValueError):
+    pass
+
+# the application catalog with details of every application is generated by database/build.py and its
+# records are read from the file as each page is shown, otherwise the applications database is used and
+# each repository is read individually
+APPLICATIONS_SOURCES = (
+    (CATALOG_URL, ".bin"),
+    (APPLICATIONS_URL, ".json"),
+)
+
+def open_applications(path: str) -> Catalog|dict:
+    if path.endswith(".bin"):
+        return Catalog(open(path, "rb"))
+    with open(path, "r") as f:
+        return json.load(f)
+
+def load_icons(offline: bool = False, force: bool = False) -> None:
+    global icons_bmp, icons_palette
+    # icon atlas with the icons of every catalog application, tile 0 is the default icon
+    icons_bmp = icons_palette = None
+    if not isinstance(applications, Catalog):
+        return
+    try:
+        icons_bmp, icons_palette = load_image(ICONS_URL, offline, force)
+    except (OSError, ValueError, HttpError) as e:
+        log("Unable to fetch icon atlas! {:s}".format(str(e)))
+    else:
+        icons_palette.make_transparent(0)
+
+# start from the last good copy on the SD card if available, it is revalidated once the page has been displayed
+applications = None
+applications_cached = False
+for url, extension in APPLICATIONS_SOURCES:
+    if (path := cached_path(url)) is not None:
+        try:
+            applications = open_applications(path)
+        except (OSError, ValueError) as e:
+            log("Unable to read cached applications from {:s}! {:s}".format(path, str(e)))
+        else:
+            applications_cached = True
+            break
+
+# otherwise download it now
+if applications is None:
+    for url, extension in APPLICATIONS_SOURCES:
+        try:
+            applications = open_applications(_download_file(url, extension, kind="catalog"))
+        except (OSError, ValueError, HttpError) as e:
+            log("Unable to fetch applications from {:s}! {:s}".format(url, str(e)))
+        else:
+            break
+
+if applications is None:
     reset(3)
 
+icons_bmp = icons_palette = None
+load_icons(True)
+
 categories = list(applications.keys())
 selected_category = None
 
 # setup menu
 category_group = displayio.Group(scale=SCALE)
 root_group.append(category_group)
-MENU_WIDTH = (DISPLAY_WIDTH - MENU_GAP * (len(categories) + 1)) // len(categories)
-for index, category in enumerate(categories):
-    category_button = Button(
-        x=(MENU_WIDTH + MENU_GAP) * index + MENU_GAP,
-        y=TITLE_HEIGHT,
-        width=MENU_WIDTH,
-        label=category,
-        **BUTTON_PROPS,
-    )
-    category_group.append(category_button)
+
+def create_menu() -> None:
+    while len(category_group):
+        category_group.pop()
+    menu_width = (DISPLAY_WIDTH - MENU_GAP * (len(categories) + 1)) // len(categories)
+    for index, category in enumerate(categories):
+        category_button = Button(
+            x=(menu_width + MENU_GAP) * index + MENU_GAP,
+            y=TITLE_HEIGHT,
+            width=menu_width,
+            label=category,
+            **BUTTON_PROPS,
+        )
+        category_group.append(category_button)
+
+create_menu()
 
 # setup items
 item_grid = GridLayout(
@@ -368,16 +1151,21 @@ item_grid = GridLayout(
 )
 root_group.append(item_grid)
 
+def create_item_icon() -> displayio.TileGrid:
+    return displayio.TileGrid(
+        bitmap=icons_bmp if icons_bmp is not None else default_icon_bmp,
+        pixel_shader=icons_palette if icons_bmp is not None else default_icon_palette,
+        tile_width=ICON_SIZE,
+        tile_height=ICON_SIZE,
+        x=(ITEM_HEIGHT - ICON_SIZE) // 2,
+        y=(ITEM_HEIGHT - ICON_SIZE) // 2,
+    )
+
 for index in range(PAGE_SIZE):
     item_group = AnchoredGroup()
     item_group.hidden = True
 
-    item_icon = displayio.TileGrid(
-        bitmap=default_icon_bmp,
-        pixel_shader=default_icon_palette,
-        x=(ITEM_HEIGHT - default_icon_bmp.height) // 2,
-        y=(ITEM_HEIGHT - default_icon_bmp.height) // 2,
-    )
+    item_icon = create_item_icon()
     item_group.append(item_icon)
 
     item_installed = displayio.TileGrid(
@@ -387,6 +1175,14 @@ for index in range(PAGE_SIZE):
     )
     item_group.append(item_installed)
 
+    item_update = displayio.TileGrid(
+        bitmap=update_bmp,
+        pixel_shader=update_palette,
+        x=item_icon.x + ICON_SIZE - update_bmp.width - 2, y=item_icon.y + 2,
+    )
+    item_update.hidden = True
+    item_group.append(item_update)
+
     item_title = Label(
         font=FONT,
         text="[title]",
@@ -550,6 +1346,10 @@ def hide_dialog() -> None:
 
 # item navigation
 
+def get_item_group(index: int) -> AnchoredGroup:
+    index %= PAGE_SIZE
+    return item_grid.get_content((index % PAGE_COLUMNS, index // PAGE_COLUMNS))
+
 def select_category(name: str) -> None:
     global selected_category
     if name not in categories or name == selected_category:
@@ -559,17 +1359,86 @@ def select_category(name: str) -> None:
     # update button states
     for category_button in category_group:
         category_button.selected = category_button.label == name
+
+    # stop loading the previous category
+    cancel_page_loader()
     
     # hide all items
     for index in range(PAGE_SIZE):
-        item_grid.get_content((index % PAGE_COLUMNS, index // PAGE_COLUMNS)).hidden = True
+        get_item_group(index).hidden = True
 
     # load first page of items
     show_page()
 
+def read_application_details(category: str, index: int, claimed: bool = False) -> dict|None:
+    # use catalog record if available to avoid querying the repository
+    if isinstance(applications, Catalog):
+        return applications[category].details(index)
+
+    full_name = applications[category][index]
+    log("Reading repository data from {:s}".format(full_name))
+
+    # get repository info
+    details = {
+        "full_name": full_name,
+        "title": None,
+        "author": full_name.split("/")[0],
+        "description": "",
+        "default_branch": "main",
+        "icon": None,
+        "icon_index": 0,
+    }
+    try:
+        repository = download_json(
+            url=REPO_URL.format(full_name),
+            kind="repository",
+            claimed=claimed,
+        )
+    except (OSError, ValueError, HttpError) as e:
+        # continue with the metadata from raw.githubusercontent.com which isn't rate limited
+        log("Unable to read repository data from {:s}! {:s}".format(full_name, str(e)))
+    else:
+        details["author"] = repository["owner"]["login"]
+        details["description"] = repository["description"] or ""
+        details["default_branch"] = repository["default_branch"]
+
+    # read metadata from repository
+    log("Reading metadata from {:s}".format(full_name))
+    try:
+        metadata = download_json(
+            url=METADATA_URL.format(full_name),
+            kind="metadata",
+            claimed=claimed,
+        )
+    except (OSError, ValueError, HttpError) as e:
+        log("Unable to read metadata from {:s}! {:s}".format(full_name, str(e)))
+    else:
+        details["title"] = metadata["title"]
+        if "description" in metadata:
+            details["description"] = metadata["description"]
+        if "icon" in metadata:
+            details["icon"] = ICON_URL.format(full_name, details["default_branch"], metadata["icon"])
+
+    return details
+
+page_loader = None
+def cancel_page_loader() -> None:
+    global page_loader
+    if page_loader is not None:
+        page_loader.close()
+        page_loader = None
+
+def step_page_loader() -> None:
+    global page_loader
+    if page_loader is not None:
+        try:
+            next(page_loader)
+        except StopIteration:
+            page_loader = None
+
 current_page = 0
 def show_page(page: int = 0) -> None:
-    global selected_category, current_page
+    global selected_category, current_page, page_loader
 
     # determine indices
     start = page * PAGE_SIZE
@@ -577,9 +1446,12 @@ def show_page(page: int = 0) -> None:
     if start < 0 or start >= len(applications[selected_category]):
         return
 
+    # stop loading the previous page
+    cancel_page_loader()
+
     # hide all items
     for index in range(PAGE_SIZE):
-        item_grid.get_content((index % PAGE_COLUMNS, index // PAGE_COLUMNS)).hidden = True
+        get_item_group(index).hidden = True
 
     # update page label
     current_page = page
@@ -592,8 +1464,8 @@ def show_page(page: int = 0) -> None:
 
     # display default details
     for index in range(start, end):
-        item_group = item_grid.get_content((index % PAGE_COLUMNS, index // PAGE_COLUMNS))
-        item_icon, item_installed, item_title, item_author, item_description = item_group
+        item_group = get_item_group(index)
+        item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
 
         full_name = applications[selected_category][index]
         repo_owner, repo_name = full_name.split("/")
@@ -605,71 +1477,101 @@ def show_page(page: int = 0) -> None:
             title = title[len("Fruit Jam"):].strip()
         
         # set default details
-        item_icon.bitmap = default_icon_bmp
-        item_icon.pixel_shader = default_icon_palette
+        if icons_bmp is not None:
+            item_icon[0] = 0
+        else:
+            item_icon.bitmap = default_icon_bmp
+            item_icon.pixel_shader = default_icon_palette
         item_installed.hidden = not is_app_installed(repo_name)
+        item_update.hidden = item_installed.hidden or not is_update_available(full_name)
         item_title.text = title
         item_author.text = repo_owner
         item_description.text = "Loading..."
         item_group.hidden = False
-    
-    # read external application data
+
+    # external application data is read by the control loop between input polls
+    page_loader = load_page(selected_category, start, end)
+
+def load_page(category: str, start: int, end: int) -> typing.Generator:
+    loaded = set()
+
+    # request the expired repository data and metadata of every item at once and fill in each
+    # item as soon as both have arrived rather than waiting on each request in turn
+    claimed = set()  # items with every expired request claimed from the rate limit, failed ones are retried without another claim
+    if not isinstance(applications, Catalog):
+        files, pending, refused = [], [], set()
+        for index in range(start, end):
+            full_name = applications[category][index]
+            for url, kind in ((REPO_URL.format(full_name), "repository"), (METADATA_URL.format(full_name), "metadata")):
+                if is_cache_fresh(cache_entry(url), kind):
+                    continue
+                if use_api(url):
+                    files.append((url, ".json", kind))
+                    pending.append(index)
+                else:
+                    refused.add(index)
+        claimed = set(pending) - refused
+        remaining = {}
+        for index in pending:
+            remaining[index] = remaining.get(index, 0) + 1
+        fetcher = fetch_files(files)
+        try:
+            for result in fetcher:
+                if result is None:
+                    yield
+                    continue
+                index = pending[result]
+                remaining[index] -= 1
+                if not remaining[index]:
+                    yield from load_item(category, index, index in claimed)
+                    loaded.add(index)
+        finally:
+            fetcher.close()  # release its connections if the page is abandoned
+
+    # read external application data, yielding between each request
     for index in range(start, end):
-        item_group = item_grid.get_content((index % PAGE_COLUMNS, index // PAGE_COLUMNS))
-        item_icon, item_installed, item_title, item_author, item_description = item_group
+        if index not in loaded:
+            yield
+            yield from load_item(category, index, index in claimed)
 
-        full_name = applications[selected_category][index]
+    log("Page loaded!")
 
-        log("Reading repository data from {:s}".format(full_name))
+def load_item(category: str, index: int, claimed: bool = False) -> typing.Generator:
+    item_group = get_item_group(index)
+    item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
 
-        # get repository info
-        try:
-            repository = download_json(
-                url=REPO_URL.format(full_name),
-                name=full_name.replace("/", "_"),
-            )
-        except (OSError, ValueError, HttpError) as e:
-            item_description.text = ""
-            log("Unable to read repository data from {:s}! {:s}".format(full_name, str(e)))
-            time.sleep(1)
-            continue
-        else:
-            item_author.text = repository["owner"]["login"]
-            item_description.text = repository["description"]
+    full_name = applications[category][index]
 
-        # read metadata from repository
-        log("Reading metadata from {:s}".format(full_name))
+    details = read_application_details(category, index, claimed)
+    if details is None:
+        item_description.text = ""
+        return
+
+    item_author.text = details["author"]
+    item_description.text = details["description"]
+    if full_name in install_states:
+        install_states[full_name][1] = details["description"]
+        item_description.text = install_states[full_name][0]
+    if details["title"] is not None:
+        item_title.text = details["title"]
+
+    if icons_bmp is not None:
+        # the atlas is cached separately from the catalog and may be from an older build with fewer tiles
+        tiles = (icons_bmp.width // ICON_SIZE) * (icons_bmp.height // ICON_SIZE)
+        item_icon[0] = details["icon_index"] if details["icon_index"] < tiles else 0
+    elif details["icon"] is not None:
+        yield
+        log("Loading icon from {:s}".format(full_name))
         try:
-            metadata = download_json(
-                url=METADATA_URL.format(full_name),
-                name=full_name.replace("/", "_") + "_metadata",
-            )
+            icon_bmp, icon_palette = load_icon(details["icon"])
         except (OSError, ValueError, HttpError) as e:
-            log("Unable to read metadata from {:s}! {:s}".format(full_name, str(e)))
+            log("Unable to download icon image from {:s}! {:s}".format(full_name, str(e)))
         else:
-            item_title.text = metadata["title"]
-
-            if "description" in metadata:
-                item_description.text = metadata["description"]
+            item_icon.bitmap = icon_bmp
+            item_icon.pixel_shader = icon_palette
 
-            if "icon" in metadata:
-                log("Downloading icon from {:s}".format(full_name))
-                try:
-                    icon_path = download_image(
-                        ICON_URL.format(full_name, repository["default_branch"], metadata["icon"]),
-                        repository["name"] + "_" + metadata["icon"],
-                    )
-                except (OSError, ValueError, HttpError) as e:
-                    log("Unable to download icon image from {:s}! {:s}".format(full_name, str(e)))
-                else:
-                    icon_bmp, icon_palette = adafruit_imageload.load(icon_path)
-                    item_icon.bitmap = icon_bmp
-                    item_icon.pixel_shader = icon_palette
-
-        # cleanup before loading next item
-        gc.collect()
-
-    log("Page loaded!")
+    # cleanup before loading next item
+    gc.collect()
 
 def next_page() -> None:
     global current_page
@@ -683,75 +1585,454 @@ def refresh_page() -> None:
     global current_page
     show_page(current_page)
 
+# prefetch adjacent pages and categories while idle
+
+prefetch_requests = PREFETCH_REQUESTS
+def prefetch_file(url: str, extension: str, kind: str) -> typing.Generator:
+    global prefetch_requests
+    # yield before making a request and stop once the budget has been used
+    if not is_cache_fresh(cache_entry(url), kind):
+        if prefetch_requests <= 0:
+            return None
+        prefetch_requests -= 1
+        yield
+    try:
+        return _download_file(url, extension, kind=kind, background=True)
+    except (OSError, ValueError, HttpError):
+        return None
+
+def prefetch(category: str, page: int) -> typing.Generator:
+    pages = [(category, page + 1), (category, page - 1)]
+    pages += list(map(lambda name: (name, 0), filter(lambda name: name != category, categories)))
+    for category, page in pages:
+        if page < 0:
+            continue
+        for index in range(page * PAGE_SIZE, min((page + 1) * PAGE_SIZE, len(applications[category]))):
+            yield
+            full_name = applications[category][index]
+
+            # catalog records are already available, otherwise read repository and metadata
+            icon = None
+            if isinstance(applications, Catalog):
+                icon = applications[category].details(index)["icon"] if icons_bmp is None else None
+            else:
+                repository_path = yield from prefetch_file(REPO_URL.format(full_name), ".json", "repository")
+                metadata_path = yield from prefetch_file(METADATA_URL.format(full_name), ".json", "metadata")
+                if metadata_path is None:
+                    continue
+                default_branch = "main"
+                try:
+                    if repository_path is not None:
+                        with open(repository_path, "r") as f:
+                            default_branch = json.load(f)["default_branch"]
+                    with open(metadata_path, "r") as f:
+                        metadata = json.load(f)
+                except (OSError, ValueError, KeyError):
+                    continue
+                if "icon" in metadata:
+                    icon = ICON_URL.format(full_name, default_branch, metadata["icon"])
+
+            # download icon and decode it if there's memory to spare
+            if icon is not None and (yield from prefetch_file(icon, ".bmp", "icon")) is not None:
+                if icon not in icon_cache and gc.mem_free() > ICON_CACHE_MEM_FREE * 2:
+                    yield
+                    try:
+                        load_icon(icon)
+                    except (OSError, ValueError, HttpError):
+                        pass
+            gc.collect()
+
+prefetcher = None
+prefetched_page = None
+def step_prefetcher() -> None:
+    global prefetcher, prefetched_page
+    # restart whenever another page is displayed
+    if prefetched_page != (selected_category, current_page):
+        if prefetcher is not None:
+            prefetcher.close()
+        prefetched_page = (selected_category, current_page)
+        prefetcher = prefetch(selected_category, current_page)
+    if prefetcher is not None:
+        try:
+            next(prefetcher)
+        except StopIteration:
+            prefetcher = None
+
+def update_badges() -> None:
+    global selected_category, current_page
+    for index in range(current_page * PAGE_SIZE, min((current_page + 1) * PAGE_SIZE, len(applications[selected_category]))):
+        item_group = get_item_group(index)
+        item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
+        item_update.hidden = item_installed.hidden or not is_update_available(applications[selected_category][index])
+
+def find_item_group(full_name: str) -> AnchoredGroup|None:
+    global selected_category, current_page
+    for index in range(current_page * PAGE_SIZE, min((current_page + 1) * PAGE_SIZE, len(applications[selected_category]))):
+        if applications[selected_category][index] == full_name:
+            return get_item_group(index)
+    return None
+
+def refresh_item(full_name: str) -> None:
+    # only update the state of the affected item rather than reloading the whole page
+    if (item_group := find_item_group(full_name)) is not None:
+        item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
+        item_installed.hidden = not is_app_installed(full_name.split("/")[1])
+        item_update.hidden = item_installed.hidden or not is_update_available(full_name)
+
 # select first category and show page items
 select_category(categories[0])
 
-# application download
+# background tasks, run from the control loop once the first page has been displayed
+
+def revalidate_applications() -> None:
+    global applications, categories, selected_category
+    url, extension = APPLICATIONS_SOURCES[0 if isinstance(applications, Catalog) else 1]
+    entry = cache_entry(url)
+    validators = (entry["etag"], entry["size"]) if entry is not None else None
+    previous_entry = dict(entry) if entry is not None else None
+    previous = applications
+    # the file the current applications were read from, named by store_response
+    previous_path = cached_path(url) or CACHE_DIR + "/" + cache_key(url) + extension
+
+    # the catalog file is kept open and may be replaced, the previous file is kept as .old until the new one opens
+    if isinstance(applications, Catalog):
+        applications.close()
+    try:
+        path = _download_file(url, extension, kind="catalog")
+    except (OSError, ValueError, HttpError) as e:
+        log("Unable to revalidate applications! {:s}".format(str(e)))
+        path = cached_path(url) or previous_path
+    try:
+        applications = open_applications(path)
+    except (OSError, ValueError) as e:
+        log("Unable to read applications, keeping the previous ones! {:s}".format(str(e)))
+        if previous_entry is not None and exists(path + ".old"):
+            os.remove(path)
+            os.rename(path + ".old", path)
+            cache_manifest["entries"][cache_key(url)] = previous_entry
+            save_cache_manifest()
+        try:
+            applications = open_applications(path) if isinstance(previous, Catalog) else previous
+        except (OSError, ValueError) as e:
+            log("Unable to read previous applications! {:s}".format(str(e)))
+            reset(3)
+        return
+    if exists(path + ".old"):
+        os.remove(path + ".old")
 
-def download_application(full_name: str = None) -> bool:
-    global selected_application
-    if full_name is None:
-        if selected_application is None:
-            return False
-        full_name = selected_application
+    entry = cache_entry(url)
+    if entry is None or (entry["etag"], entry["size"]) == validators:
+        return
+
+    # quietly swap in the new applications
+    log("Applications updated!")
+    if list(applications.keys()) != categories:
+        categories = list(applications.keys())
+        create_menu()
+    load_icons(force=True)
+    for index in range(PAGE_SIZE):
+        get_item_group(index)[0] = create_item_icon()
+    name = selected_category if selected_category in categories else categories[0]
+    selected_category = None
+    select_category(name)
+
+def check_all_updates() -> None:
+    # check installed applications for new releases
+    if (update_count := check_updates(list(set(full_name for category in categories for full_name in applications[category])))):
+        log("{:d} update(s) available!".format(update_count))
+        update_badges()
+
+background_tasks = [check_all_updates]
+if applications_cached:
+    background_tasks.insert(0, revalidate_applications)
+
+# application download, installs are queued and run by the control loop one file at a time while
+# the next application's release and bundle directory are fetched in between
+
+install_sessions = [None, None]
+def get_install_session(slot: int = 0) -> "adafruit_requests.Session":
+    # separate sessions keep their own connections since a session closes its previous response on each request,
+    # browsing uses another session and the next application's bundle is opened in the other slot while extracting
+    get_requests()  # connect
+    if install_sessions[slot] is None:
+        install_sessions[slot] = adafruit_requests.Session(
+            socket_pool,
+            ssl_context,
+            session_id="install{:d}".format(slot),
+        )
+    return install_sessions[slot]
+
+def open_release(full_name: str, update: bool = False, slot: int = 0) -> typing.Generator:
     repo_owner, repo_name = full_name.split("/")
-    path = "/sd/apps/{:s}".format(repo_name)
-    
-    if is_app_installed(repo_name):
-        return False
 
-    # get repository info
+    # get release info from the catalog, otherwise request it, yielding while the request is in flight
     log("Reading release data from {:s}".format(full_name))
+    release = read_catalog_releases((full_name,)).get(full_name)
+    if release is None:
+        url = RELEASE_URL.format(full_name)
+        claimed = (update or not is_cache_fresh(cache_entry(url), "release")) and use_api(url)
+        if claimed:
+            yield from fetch_files([(url, ".json", "release")])
+        try:
+            data = download_json(
+                url=url,
+                kind="release",
+                claimed=claimed,
+            )
+            asset = list(filter(lambda x: x["name"].endswith(".zip"), data["assets"]))[0]
+        except (OSError, ValueError, IndexError, KeyError, HttpError) as e:
+            log("Unable to read release data from {:s}! {:s}".format(full_name, str(e)))
+            return None
+        release = {
+            "tag": data["tag_name"],
+            "asset_id": asset["id"],
+            "url": asset["browser_download_url"],
+        }
+    yield
+
+    # determine correct inner path based on CP version, the first directory containing code.py is used
+    sources = (repo_name + "/" + VERSION_DIR, VERSION_DIR, repo_name, "")
+
+    # open project bundle, only fetching the byte ranges we need if the host allows it
+    log("Reading release assets...")
+    progress = Progress(
+        "Updating" if update else "Installing",
+        show=lambda msg: set_install_state(full_name, msg),
+    )
     try:
-        release = download_json(
-            url=RELEASE_URL.format(full_name),
-            name=full_name.replace("/", "_") + "_release",
-        )
-    except (OSError, ValueError, HttpError) as e:
-        log("Unable to read release data from {:s}! {:s}".format(full_name, str(e)))
-        return False
-    
-    # download project bundle
-    log("Downloading release assets...")
-    asset = list(filter(lambda x: x["name"].endswith(".zip"), release["assets"]))[0]
+        zip_file = HTTPRangeFile(get_install_session(slot), release["url"], progress=progress)
+    except RangeNotSupported:
+        # otherwise stream the whole bundle and extract files as they arrive
+        try:
+            response = get_install_session(slot).get(release["url"], stream=True)
+            if response.status_code != 200:
+                close_response(response)
+                raise HttpError("Code {:d}".format(response.status_code), response)
+        except (OSError, RuntimeError, ValueError, HttpError) as e:
+            log("Failed to download release assets for {:s}! {:s}".format(full_name, str(e)))
+            return None
+        progress.total = int(response.headers.get("content-length", 0))
+        return {
+            "release": release,
+            "file": HTTPStream(response, progress=progress),
+            "sources": sources,
+        }
+    except (OSError, RuntimeError, ValueError, HttpError) as e:
+        log("Failed to read release assets for {:s}! {:s}".format(full_name, str(e)))
+        return None
+
+    # read the central directory and find code.py
     try:
-        zip_path = download_zip(asset["browser_download_url"], repo_name)
-    except (OSError, ValueError, HttpError) as e:
-        log("Failed to download release assets for {:s}! {:s}".format(full_name, str(e)))
-        return False
-    
-    # read archived file
-    log("Installing application...")
-    result = False
-    with open(zip_path, "rb") as f:
-        zf = ZipFile(f)
-        
-        # determine correct inner path based on CP version
-        major_version = int(os.uname().release.split(".")[0])
-        version_name = "CircuitPython {:d}.x".format(major_version)
-        for dirpath in (repo_name + "/" + version_name, version_name, repo_name, ""):
+        zf = ZipFile(zip_file, compact=True)
+        for dirpath in sources:
             try:
                 zf[(dirpath + "/code.py").strip("/")]
             except KeyError:
                 pass
             else:
                 break
-        
-        # make sure we found code.py
+        else:
+            dirpath = None
+    except (OSError, BadZipFile) as e:
+        log("Failed to read release assets for {:s}! {:s}".format(full_name, str(e)))
+        zip_file.close()
+        return None
+
+    # only the compressed data of the extracted members is fetched
+    if dirpath is not None:
+        progress.total = progress.done + sum(map(
+            lambda member: member[0].compressed_size,
+            plan_extraction(zf, dirpath)[1]
+        ))
+    return {
+        "release": release,
+        "file": zip_file,
+        "zip": zf,
+        "dirpath": dirpath,
+    }
+
+def close_release(bundle: dict|None) -> None:
+    if bundle is not None:
+        bundle["file"].close()
+
+def cancel_release(opening: list|None) -> None:
+    # stop opening an application ahead of its turn, [full_name, opener, bundle]
+    if opening is not None:
+        if opening[1] is not None:
+            opening[1].close()
+        close_release(opening[2])
+
+def extract_release(full_name: str, bundle: dict, update: bool = False) -> typing.Generator:
+    repo_owner, repo_name = full_name.split("/")
+    path = "/sd/apps/{:s}".format(repo_name)
+
+    # read archived file
+    log("{:s} {:s}...".format("Updating" if update else "Installing", repo_name))
+    result = False
+    paths = None
+    with bundle["file"]:
         try:
-            zf[(dirpath + "/code.py").strip("/")]
-        except KeyError:
-            log("Could not locate application files within release!")
+            if "zip" not in bundle:
+                paths, written, size = yield from extractstream(ZipStream(bundle["file"]), path, bundle["sources"], update)
+            elif bundle["dirpath"] is not None:
+                paths, written, size = yield from extractall(bundle["zip"], path, bundle["dirpath"], update)
+            if paths is not None and "code.py" in paths:
+                # the SD card may fill up or be read-only until the release info is written
+                removed = prune(path, paths) if update else 0
+                write_installed_release(repo_name, bundle["release"], size)
+                result = True
+            else:
+                log("Could not locate application files within release!")
+        except (OSError, BadZipFile) as e:
+            log("Failed to {:s} {:s}! {:s}".format("update" if update else "install", full_name, str(e)))
+    if result:
+        if update:
+            log("Successfully updated {:s}! {:d} file(s) written, {:d} removed.".format(full_name, written, removed))
         else:
-            # extract files
-            extractall(zf, path, dirpath)
             log("Successfully installed {:s}!".format(full_name))
-            result = True
-    
-    # remove zip file
-    os.remove(zip_path)
+
+    # clean up incomplete installation
+    if not update and not result and exists(path):
+        rmtree(path)
     return result
 
+install_queue = []  # (full_name, update) of queued applications, the first is being installed
+install_states = {}  # full_name: [status shown in place of the description, description]
+installer = None
+
+def set_install_state(full_name: str, state: str|None) -> None:
+    # ignore applications which have since been removed from the queue
+    if full_name not in install_states:
+        return
+    if state is not None:
+        install_states[full_name][0] = state
+    if (item_group := find_item_group(full_name)) is not None:
+        item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
+        if state is not None:
+            item_description.text = state
+        elif (details := install_states.get(full_name)) is not None and details[1] is not None:
+            item_description.text = details[1]
+    if state is None:
+        del install_states[full_name]
+
+def queue_install(full_name: str, update: bool = False) -> bool:
+    global installer
+    if full_name in install_states:
+        return False
+    install_queue.append((full_name, update))
+
+    # the description is restored once installed
+    description = None
+    if (item_group := find_item_group(full_name)) is not None:
+        item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
+        description = item_description.text
+    install_states[full_name] = ["Queued", description]
+    set_install_state(full_name, "Queued")
+    if installer is None:
+        installer = install_queued()
+    return True
+
+def dequeue_install(full_name: str = None) -> bool:
+    global selected_application
+    if full_name is None:
+        if selected_application is None:
+            return False
+        full_name = selected_application
+
+    # the first application is already being installed
+    for i in range(1, len(install_queue)):
+        if install_queue[i][0] == full_name:
+            install_queue.pop(i)
+            set_install_state(full_name, None)
+            break
+    deselect_application()
+    return True
+
+def install_queued() -> typing.Generator:
+    installed = 0
+    failed = 0
+    following = None  # [full_name, opener, bundle] of the next application
+    slot = 0  # install session of the current application, the next one is opened in the other
+    while install_queue:
+        full_name, update = install_queue[0]
+        set_install_state(full_name, "Downloading...")
+        yield
+
+        # continue opening the application if it was started during the previous one
+        if following is not None and following[0] == full_name:
+            bundle = (yield from following[1]) if following[1] is not None else following[2]
+        else:
+            cancel_release(following)
+            bundle = yield from open_release(full_name, update, slot)
+        following = None
+
+        # extract one file at a time, fetching the next application's release between them
+        result = False
+        if bundle is not None:
+            extractor = extract_release(full_name, bundle, update)
+            while True:
+                try:
+                    next(extractor)
+                except StopIteration as e:
+                    result = e.value
+                    break
+                if following is None and len(install_queue) > 1:
+                    following = [install_queue[1][0], open_release(*install_queue[1], slot=1 - slot), None]
+                if following is not None and following[1] is not None and following[0] in install_states:
+                    try:
+                        next(following[1])
+                    except StopIteration as e:
+                        following[1], following[2] = None, e.value
+                yield
+
+        install_queue.pop(0)
+        set_install_state(full_name, None)
+        refresh_item(full_name)
+        slot = 1 - slot
+        if result:
+            installed += 1
+        else:
+            failed += 1
+        gc.collect()
+
+    # the next application may have been removed from the queue while it was opened
+    cancel_release(following)
+
+    if installed + failed > 1:
+        log("{:d} application(s) installed{:s}".format(installed, ", {:d} failed!".format(failed) if failed else "!"))
+
+def step_installer() -> None:
+    global installer
+    if installer is not None:
+        try:
+            next(installer)
+        except StopIteration:
+            installer = None
+
+def download_application(full_name: str = None) -> bool:
+    global selected_application
+    if full_name is None:
+        if selected_application is None:
+            return False
+        full_name = selected_application
+    repo_owner, repo_name = full_name.split("/")
+    
+    if is_app_installed(repo_name):
+        return False
+    return queue_install(full_name)
+
+def update_application(full_name: str = None) -> bool:
+    global selected_application
+    if full_name is None:
+        if selected_application is None:
+            return False
+        full_name = selected_application
+    repo_owner, repo_name = full_name.split("/")
+    
+    if not is_app_installed(repo_name):
+        return False
+    return queue_install(full_name, update=True)
+
 def remove_application(full_name: str = None) -> bool:
     global selected_application
     if full_name is None:
@@ -771,6 +2052,7 @@ def remove_application(full_name: str = None) -> bool:
         log("Failed to delete {:s}: {:s}".format(path, str(e)))
         return False
     else:
+        remove_installed_app(repo_name)
         log("Successfully deleted application!")
         return True
 
@@ -810,11 +2092,22 @@ def select_application(index: int) -> None:
     arrow_group.hidden = True
     
     # populate dialog info
-    page_index = index % PAGE_SIZE
-    item_group = item_grid.get_content((page_index % PAGE_COLUMNS, page_index // PAGE_COLUMNS))
-    item_icon, item_installed, item_title, item_author, item_description = item_group
+    item_group = get_item_group(index)
+    item_icon, item_installed, item_update, item_title, item_author, item_description = item_group
 
-    if item_installed.hidden:
+    if selected_application in install_states:
+        actions = [("Close", deselect_application)]
+        if install_queue[0][0] != selected_application:
+            actions.append(("Cancel", dequeue_install))
+        show_dialog(
+            content="\"{:s}\" is queued to be {:s}. {:d} application(s) remaining in the queue.".format(
+                item_title.text,
+                "updated" if dict(install_queue)[selected_application] else "installed",
+                len(install_queue),
+            ),
+            actions=actions,
+        )
+    elif item_installed.hidden:
         show_dialog(
             content="Would you like to download and install \"{:s}\" by {:s} to your SD card at /sd/apps/{:s}?".format(
                 item_title.text,
@@ -828,13 +2121,14 @@ def select_application(index: int) -> None:
         )
     else:
         show_dialog(
-            content="The application, \"{:s}\", is already installed. Would you like to remove it from your SD card at /sd/apps/{:s}? Any save data within /saves will be retained.".format(
+            content="The application, \"{:s}\", is already installed. Would you like to update it or remove it from your SD card at /sd/apps/{:s}? Any save data within /saves will be retained.".format(
                 item_title.text,
                 repo_name
             ),
             actions=[
                 ("Cancel", deselect_application),
                 ("Remove", toggle_application),
+                ("Update", apply_update),
                 ("Open", open_application),
             ],
         )
@@ -866,7 +2160,21 @@ def toggle_application(full_name: str = None) -> bool:
 
     # hide dialog and update installed state
     deselect_application()
-    refresh_page()
+    refresh_item(full_name)
+
+    return result
+
+def apply_update(full_name: str = None) -> bool:
+    global selected_application
+    if full_name is None:
+        if selected_application is None:
+            return False
+        full_name = selected_application
+    result = update_application(full_name)
+
+    # hide dialog and update item state
+    deselect_application()
+    refresh_item(full_name)
 
     return result
 
@@ -882,6 +2190,7 @@ if config is not None and config.use_mouse and (mouse := adafruit_usb_host_mouse
     root_group.append(mouse_group)
 
 def atexit_callback() -> None:
+    flush_cache_manifest(True)
     if mouse and mouse.was_attached and not mouse.device.is_kernel_driver_active(0):
         mouse.device.attach_kernel_driver(0)
 atexit.register(atexit_callback)
@@ -895,6 +2204,17 @@ try:
     previous_mouse_state = False
     while True:
 
+        # load page items, otherwise install queued applications or run background tasks
+        if page_loader is not None:
+            step_page_loader()
+        elif installer is not None:
+            step_installer()
+        elif background_tasks and dialog_buttons.hidden:
+            background_tasks.pop(0)()
+        elif dialog_buttons.hidden:
+            step_prefetcher()
+        flush_cache_manifest()
+
         # keyboard input
         if (available := supervisor.runtime.serial_bytes_available) > 0:
             key = sys.stdin.read(available)
@@ -2,23 +2,115 @@
 # SPDX-FileCopyrightText: Copyright 2025 Cooper Dalrymple (@relic-se)
 #
 # SPDX-License-Identifier: MIT
+from io import BytesIO
 import json
+import math
 import os
 from pathlib import Path
 import re
+import struct
 
-from github import Github
+from github import Auth, Github
 from mdutils.mdutils import MdUtils
+from PIL import Image
 
 DATABASE_FILE = "applications.json"
 MARKDOWN_FILE = "README.md"
+CATALOG_FILE = "catalog.bin"
+ICONS_FILE = "icons.bmp"
+
+# icon atlas, tile 0 is the default icon and palette index 0 is transparent
+DEFAULT_ICON_FILE = "../bitmaps/default_icon.bmp"
+ICON_SIZE = 64
+ICON_COLUMNS = 8
+
+# binary catalog structures (read by catalog.py on the device)
+CATALOG_MAGIC = b"FJLC"
+CATALOG_VERSION = 2
+CATALOG_HEADER_STRUCT = "<4sBB"
+CATALOG_CATEGORY_STRUCT = "<BHL"
+CATALOG_OFFSET_STRUCT = "<L"
+CATALOG_RECORD_STRUCT = "<2L9H"
+
+def read_icon(data: bytes, transparent_index: int|None = None) -> Image:
+    image = Image.open(BytesIO(data))
+    if transparent_index is not None and image.mode == "P":
+        image.info["transparency"] = transparent_index
+    image = image.convert("RGBA")
+    if image.size != (ICON_SIZE, ICON_SIZE):
+        image = image.resize((ICON_SIZE, ICON_SIZE))
+    return image
+
+def write_icon_atlas(path: Path, icons: list) -> None:
+    # arrange icons into rows of tiles
+    rows = math.ceil(len(icons) / ICON_COLUMNS)
+    atlas = Image.new("RGBA", (ICON_SIZE * min(len(icons), ICON_COLUMNS), ICON_SIZE * rows))
+    for index, icon in enumerate(icons):
+        atlas.paste(icon, ((index % ICON_COLUMNS) * ICON_SIZE, (index // ICON_COLUMNS) * ICON_SIZE))
+
+    # share a single palette between all icons, leaving index 0 for transparency
+    quantized = atlas.convert("RGB").quantize(colors=255, dither=Image.Dither.NONE)
+    alpha = atlas.getchannel("A").getdata()
+    output = Image.new("P", atlas.size)
+    output.putdata(list(map(
+        lambda pixel: pixel[0] + 1 if pixel[1] >= 128 else 0,
+        zip(quantized.getdata(), alpha)
+    )))
+    output.putpalette([0xff, 0x00, 0xff] + quantized.getpalette()[:255 * 3])
+    output.save(path, "BMP")
+
+def write_catalog_bin(path: Path, catalog: dict) -> None:
+    # encode records first to determine offsets
+    categories = []
+    for category, entries in catalog.items():
+        records = []
+        for entry in entries:
+            release = entry["release"] or {}
+            fields = list(map(lambda value: (value or "").encode("utf-8"), (
+                entry["full_name"],
+                entry["title"],
+                entry["author"],
+                entry["description"],
+                entry["default_branch"],
+                entry["icon"],
+                release.get("tag"),
+                release.get("url"),
+            )))
+            records.append(struct.pack(
+                CATALOG_RECORD_STRUCT,
+                release.get("asset_id", 0),
+                release.get("size", 0),
+                entry["icon_index"],
+                *map(len, fields)
+            ) + b"".join(fields))
+        categories.append((category.encode("utf-8"), records))
+
+    # header and category table, followed by each category's offset table and records
+    offset = struct.calcsize(CATALOG_HEADER_STRUCT) + sum(map(
+        lambda category: struct.calcsize(CATALOG_CATEGORY_STRUCT) + len(category[0]),
+        categories
+    ))
+    header = struct.pack(CATALOG_HEADER_STRUCT, CATALOG_MAGIC, CATALOG_VERSION, len(categories))
+    body = b""
+    for name, records in categories:
+        header += struct.pack(CATALOG_CATEGORY_STRUCT, len(name), len(records), offset) + name
+        record_offset = offset + struct.calcsize(CATALOG_OFFSET_STRUCT) * len(records)
+        for record in records:
+            body += struct.pack(CATALOG_OFFSET_STRUCT, record_offset)
+            record_offset += len(record)
+        body += b"".join(records)
+        offset = record_offset
+
+    with open(path, "wb") as f:
+        f.write(header + body)
 
 def main():
     db_dir = Path(__file__).parent
 
-    # delete readme
-    if os.path.isfile(db_dir / MARKDOWN_FILE):
-        os.remove(db_dir / MARKDOWN_FILE)
+    # delete generated files
+    for filename in (MARKDOWN_FILE, CATALOG_FILE, ICONS_FILE):
+        if os.path.isfile(db_dir / filename):
+            os.remove(db_dir / filename)
 
     # read applications database
     print("Reading database")
@@ -27,7 +119,9 @@ def main():
 
     # connect with GitHub API
     print("Connecting with GitHub Web API")
-    gh = Github()
+    # authenticated requests are needed to read every repository within the rate limit
+    token = os.getenv("GITHUB_TOKEN")
+    gh = Github(auth=Auth.Token(token) if token else None)
 
     # setup README
     print("Beginning markdown file generation")
@@ -39,8 +133,14 @@ def main():
     md.new_line("Interested in contributing your Fruit Jam application? Read the [documention](./CONTRIBUTING.md) to learn more.")
     md.new_line()
 
+    # setup catalog, read by the device instead of querying each repository itself
+    catalog = {}
+    with open(db_dir / DEFAULT_ICON_FILE, "rb") as f:
+        icons = [read_icon(f.read(), 0)]
+
     for category in database.keys():
         repositories = database[category]
+        catalog[category] = []
 
         print("Generating category: {:s}".format(category))
         md.new_header(
@@ -62,6 +162,7 @@ def main():
             readme_contents = repo.get_readme().decoded_content.decode("utf-8")
             title = re.search(r'^# (.*)$', readme_contents, re.MULTILINE)
             title = title.group(1) if title is not None else repo.name
+            description = repo.description
             icon = None
 
             # read Fruit Jam OS metadata
@@ -70,6 +171,8 @@ def main():
                 if metadata_file := repo.get_contents("metadata.json"):
                     metadata = json.loads(metadata_file.decoded_content.decode("utf-8"))
                     title = metadata["title"]
+                    if "description" in metadata:
+                        description = metadata["description"]
                     if "icon" in metadata:
                         icon = metadata["icon"]
             except Exception as e:
@@ -133,16 +236,73 @@ def main():
 
             details = list(map(lambda key: "{:s}: {:s}".format(key, details[key]), details))
             md.new_list(details)
+
+            # read latest release
+            print("Reading latest release: ", end="")
+            release = None
+            try:
+                latest_release = repo.get_latest_release()
+                asset = list(filter(lambda x: x.name.endswith(".zip"), latest_release.assets))[0]
+            except Exception as e:
+                if hasattr(e, "message"):
+                    print(e.message)
+                else:
+                    print(e)
+            else:
+                release = {
+                    "tag": latest_release.tag_name,
+                    "asset_id": asset.id,
+                    "url": asset.browser_download_url,
+                    "size": asset.size,
+                }
+                print(release["tag"])
+
+            # add icon to atlas
+            icon_index = 0
+            if icon is not None:
+                print("Reading icon: ", end="")
+                try:
+                    icons.append(read_icon(repo.get_contents(icon, ref=repo.default_branch).decoded_content))
+                except Exception as e:
+                    if hasattr(e, "message"):
+                        print(e.message)
+                    else:
+                        print(e)
+                else:
+                    icon_index = len(icons) - 1
+                    print("Success!")
+
+            # add catalog entry
+            catalog[category].append({
+                "full_name": repo_slug,
+                "title": title,
+                "author": repo.owner.login,
+                "description": description or "",
+                "default_branch": repo.default_branch,
+                "icon": "https://raw.githubusercontent.com/{:s}/{:s}/{:s}".format(
+                    repo.full_name,
+                    repo.default_branch,
+                    icon
+                ) if icon is not None else None,
+                "icon_index": icon_index,
+                "release": release,
+            })
     
-    # save file
+    # save files
     print("Saving markdown into {:s}".format(MARKDOWN_FILE))
     md.create_md_file()
 
+    print("Saving catalog into {:s}".format(CATALOG_FILE))
+    write_catalog_bin(db_dir / CATALOG_FILE, catalog)
+
+    print("Saving icon atlas into {:s}".format(ICONS_FILE))
+    write_icon_atlas(db_dir / ICONS_FILE, icons)
+
     # close connection to GitHub API
     print("Closing GitHub Web API connection")
     gh.close()
 
-    print("{:s} generation completed!".format(MARKDOWN_FILE))
+    print("{:s}, {:s}, {:s} and {:s} generation completed!".format(MARKDOWN_FILE, CATALOG_FILE, ICONS_FILE))
 
 if __name__ == "__main__":
     main()
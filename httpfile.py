@@ -0,0 +1,400 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import adafruit_requests
+
+# Subclassing IOBase lets native stream consumers (ie: zlib.DecompIO) read from us
+try:
+    from io import IOBase
+except ImportError:
+    IOBase = object
+
+# Constants
+SEEK_SET = 0
+SEEK_CUR = 1
+SEEK_END = 2
+CHUNK_SIZE = 4096
+TAIL_SIZE = 4096
+SKIP_SIZE = 16384
+DRAIN_SIZE = 4096
+MAX_REDIRECTS = 5
+RESUME_ATTEMPTS = 3  # consecutive attempts to resume an interrupted stream
+CONCURRENT_REQUESTS = 4  # sockets used at once, leaving some of the coprocessor's sockets for other requests
+
+
+class RangeNotSupported(OSError):
+    pass
+
+
+class RemoteFileChanged(OSError):
+    pass
+
+
+# adafruit_requests internals (tested with the version pinned in requirements.txt) are only accessed
+# below, if they're missing the public api is used instead which is slower but otherwise equivalent
+
+def _session_internals(session) -> tuple|None:
+    # connection manager, ssl context and request writer to send requests on sockets of our choosing
+    try:
+        return session._connection_manager, session._ssl_context, session._send_request
+    except AttributeError:
+        return None
+
+
+def _remaining(response) -> int|None:
+    # size of the unread body, None if unknown (chunked or read until the connection closes)
+    if getattr(response, "_chunked", True):
+        return None
+    return getattr(response, "_remaining", None)
+
+
+def _close_socket(response) -> None:
+    # close the connection of a response rather than returning it to the pool with an unread body
+    internals = _session_internals(getattr(response, "_session", None))
+    if internals is not None:
+        internals[0].close_socket(response.socket)
+        response.socket = None
+    else:
+        # the session replaces a pooled socket which fails to send
+        response.socket.close()
+        response.close()
+
+
+def close_response(response) -> None:
+    """Close a response from an adafruit_requests Session and keep its connection
+    alive if possible. The session returns sockets to the pool on close, but a
+    connection can only be reused once the body has been read entirely, so small
+    remainders are drained and otherwise the socket is closed."""
+    if response.socket is None:
+        return
+    remaining = _remaining(response)
+    if (response.headers.get("connection", "").lower() != "close"
+            and remaining is not None and remaining <= DRAIN_SIZE):
+        try:
+            for chunk in response.iter_content(DRAIN_SIZE):
+                pass
+        except (OSError, RuntimeError):
+            pass
+        else:
+            response.close()
+            return
+    _close_socket(response)
+
+
+def _fetch_each(session, requests: list, timeout: int):
+    # one request at a time with the public api
+    for index, (url, headers) in enumerate(requests):
+        try:
+            response = session.get(url, headers=headers or {}, timeout=timeout, allow_redirects=False)
+        except (OSError, RuntimeError):
+            response = None
+        yield None
+        try:
+            yield index, response
+        finally:
+            if response is not None:
+                close_response(response)
+
+
+def fetch_all(session, requests: list, concurrency: int = CONCURRENT_REQUESTS, timeout: int = 10):
+    """Generator which makes GET requests over several connections at once. Each
+    batch of requests is sent before any response is read, so the servers handle
+    them concurrently and the total latency approaches that of the slowest one.
+    Yields None after sending each request and (index, response) as each response
+    arrives, or (index, None) if the request failed. Responses are closed once the
+    consumer resumes the generator."""
+    internals = _session_internals(session)
+    if internals is None:
+        yield from _fetch_each(session, requests, timeout)
+        return
+    connection_manager, ssl_context, send_request = internals
+    for batch in range(0, len(requests), concurrency):
+        sockets = {}
+        try:
+            # each slot uses its own pooled connection to a host, kept alive between batches
+            for index in range(batch, min(batch + concurrency, len(requests))):
+                url, headers = requests[index]
+                # split like Session.request, the request writer adds the leading "/" of the path
+                try:
+                    proto, _, host, path = url.split("/", 3)
+                    path = path.replace(" ", "%20")
+                except ValueError:
+                    proto, _, host = url.split("/", 2)
+                    path = ""
+                port = 443 if proto == "https:" else 80
+                if ":" in host:
+                    host, port = host.split(":")
+                    port = int(port)
+                for attempt in range(2):
+                    socket = None
+                    try:
+                        socket = connection_manager.get_socket(
+                            host, port, proto,
+                            session_id="fetch{:d}".format(index - batch),
+                            timeout=timeout,
+                            ssl_context=ssl_context,
+                        )
+                        send_request(socket, host, "GET", path, headers or {}, None, None, None)
+                    except (OSError, RuntimeError):
+                        # the server may have closed a pooled connection, retry once with a new one
+                        if socket is not None:
+                            connection_manager.close_socket(socket)
+                            socket = None
+                    else:
+                        break
+                sockets[index] = socket
+                yield None
+
+            for index, socket in sockets.items():
+                response = None
+                if socket is not None:
+                    try:
+                        response = adafruit_requests.Response(socket, session, "GET")
+                    except (OSError, RuntimeError):
+                        try:
+                            connection_manager.close_socket(socket)
+                        except RuntimeError:
+                            pass  # already closed by the response
+                    sockets[index] = None
+                try:
+                    yield index, response
+                finally:
+                    if response is not None:
+                        close_response(response)
+        finally:
+            # release connections of unread responses if we're closed early
+            for socket in sockets.values():
+                if socket is not None:
+                    connection_manager.close_socket(socket)
+
+
+class HTTPRangeFile(IOBase):
+    """Read-only, seekable file object for a remote resource which only fetches
+    the byte ranges that are actually read. Sequential reads share a single
+    streamed Range request, seeking elsewhere starts a new one. Interrupted
+    streams are resumed from the read position as long as the remote file is
+    unchanged, and progress is called with the size of each chunk received."""
+
+    def __init__(self, session, url: str, timeout: int = 10,
+                 chunk_size: int = CHUNK_SIZE, tail_size: int = TAIL_SIZE, progress=None):
+        self._session = session
+        self._timeout = timeout
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self._pos = 0
+        self._response = None
+        self._stream = None
+        self._stream_pos = 0
+        self._buffer = b""
+        self._buffer_start = 0
+
+        # resolve redirects once and read the tail of the file (EOCD of a zip)
+        response = None
+        for i in range(MAX_REDIRECTS):
+            response = session.get(
+                url,
+                headers={"Range": "bytes=-{:d}".format(tail_size)},
+                timeout=timeout,
+                stream=True,
+                allow_redirects=False,
+            )
+            if 300 <= response.status_code < 400 and "location" in response.headers:
+                location = response.headers["location"]
+                if location.startswith("/"):
+                    location = "/".join(url.split("/")[:3]) + location
+                close_response(response)
+                url = location
+            else:
+                break
+        self.url = url
+
+        if response.status_code != 206:
+            close_response(response)
+            raise RangeNotSupported("Code {:d} for range request".format(response.status_code))
+
+        self.size = self._parse_content_range(response.headers.get("content-range", ""))
+        # later ranges must come from the same version of the file
+        self._validator = response.headers.get("etag") or response.headers.get("last-modified")
+        self._buffer = response.content
+        if progress is not None:
+            progress(len(self._buffer))
+        self._buffer_start = self.size - len(self._buffer)
+        close_response(response)
+
+    @staticmethod
+    def _parse_content_range(value: str) -> int:
+        # ie: "bytes 1000-4095/4096"
+        try:
+            return int(value.split("/")[-1])
+        except ValueError:
+            raise RangeNotSupported("Invalid Content-Range header: {:s}".format(value))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _close_stream(self) -> None:
+        if self._response is not None:
+            close_response(self._response)
+        self._response = None
+        self._stream = None
+
+    def close(self) -> None:
+        self._close_stream()
+        self._buffer = b""
+
+    def _open_stream(self, pos: int) -> None:
+        self._close_stream()
+        headers = {"Range": "bytes={:d}-".format(pos)}
+        if self._validator:
+            headers["If-Range"] = self._validator
+        response = self._session.get(
+            self.url,
+            headers=headers,
+            timeout=self._timeout,
+            stream=True,
+        )
+        if response.status_code == 200 and self._validator:
+            # the entire file is sent instead if it doesn't match the validator
+            close_response(response)
+            raise RemoteFileChanged("Remote file changed while reading")
+        if response.status_code != 206:
+            close_response(response)
+            raise RangeNotSupported("Code {:d} for range request".format(response.status_code))
+        self._response = response
+        self._stream = response.iter_content(self._chunk_size)
+        self._stream_pos = pos
+
+    def _fill(self) -> None:
+        # continue the current stream if the read position is at or just ahead of it
+        if self._stream is None or not (0 <= self._pos - self._stream_pos <= SKIP_SIZE):
+            self._close_stream()
+        attempts = 0
+        while True:
+            try:
+                if self._stream is None:
+                    self._open_stream(self._pos)
+                chunk = next(self._stream)
+            except (RangeNotSupported, RemoteFileChanged):
+                raise
+            except (StopIteration, OSError, RuntimeError):
+                # the connection dropped or the session closed our response to handle another
+                # request, resume from the read position
+                self._close_stream()
+                attempts += 1
+                if attempts > RESUME_ATTEMPTS:
+                    raise OSError("Unexpected end of stream at {:d}".format(self._pos))
+                continue
+            if self._progress is not None:
+                self._progress(len(chunk))
+            self._buffer = chunk
+            self._buffer_start = self._stream_pos
+            self._stream_pos += len(chunk)
+            if self._stream_pos > self._pos:
+                break
+
+    def readinto(self, buf) -> int:
+        size = min(len(buf), self.size - self._pos)
+        if size <= 0:
+            return 0
+
+        start = self._pos - self._buffer_start
+        if not (0 <= start < len(self._buffer)):
+            self._fill()
+            start = self._pos - self._buffer_start
+
+        size = min(size, len(self._buffer) - start)
+        memoryview(buf)[:size] = memoryview(self._buffer)[start:start + size]
+        self._pos += size
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.size - self._pos:
+            size = max(self.size - self._pos, 0)
+        data = bytearray(size)
+        view = memoryview(data)
+        pos = 0
+        while pos < size:
+            pos += self.readinto(view[pos:])
+        return bytes(data)
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_CUR:
+            offset += self._pos
+        elif whence == SEEK_END:
+            offset += self.size
+        self._pos = min(max(offset, 0), self.size)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+
+class HTTPStream(IOBase):
+    """Sequential read-only file object over the body of a streamed HTTP response.
+    Progress is called with the size of each chunk received."""
+
+    def __init__(self, response, chunk_size: int = CHUNK_SIZE, progress=None):
+        self._response = response
+        self._progress = progress
+        self._stream = response.iter_content(chunk_size)
+        self._buffer = b""
+        self._offset = 0
+        self._pos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        if self._response is not None:
+            close_response(self._response)
+        self._response = None
+        self._stream = None
+        self._buffer = b""
+
+    def readinto(self, buf) -> int:
+        if self._offset >= len(self._buffer):
+            if self._stream is None:
+                return 0
+            try:
+                self._buffer = next(self._stream)
+            except StopIteration:
+                self.close()
+                return 0
+            self._offset = 0
+            if self._progress is not None:
+                self._progress(len(self._buffer))
+
+        size = min(len(buf), len(self._buffer) - self._offset)
+        memoryview(buf)[:size] = memoryview(self._buffer)[self._offset:self._offset + size]
+        self._offset += size
+        self._pos += size
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        data = bytearray()
+        buf = bytearray(CHUNK_SIZE)
+        while size < 0 or len(data) < size:
+            chunk_size = self.readinto(memoryview(buf)[:CHUNK_SIZE if size < 0 else min(CHUNK_SIZE, size - len(data))])
+            if not chunk_size:
+                break
+            data.extend(memoryview(buf)[:chunk_size])
+        return bytes(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def readable(self) -> bool:
+        return True
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import json
+
+# Constants
+CHUNK_SIZE = 512
+QUOTE = ord('"')
+BACKSLASH = ord("\\")
+COLON = ord(":")
+COMMA = ord(",")
+LBRACE = ord("{")
+RBRACE = ord("}")
+LBRACKET = ord("[")
+RBRACKET = ord("]")
+WHITESPACE = (0x20, 0x09, 0x0a, 0x0d)
+OPENERS = (LBRACE, LBRACKET)
+CLOSERS = (RBRACE, RBRACKET)
+DELIMITERS = (COMMA, RBRACE, RBRACKET) + WHITESPACE
+
+# Fields are selected by a structure mirroring the document:
+#
+# True:           keep the entire value
+# {key: fields}:  keep only the listed keys of an object
+# [fields]:       apply fields to each element of an array
+#
+# ie: {"owner": {"login": True}, "assets": [{"name": True}]}
+
+
+class _Stream:
+    """Buffered reader over a file object which can record the bytes it consumes."""
+
+    def __init__(self, file_obj, chunk_size: int):
+        self._file = file_obj
+        self._chunk_size = chunk_size
+        self._buffer = b""
+        self._pos = 0
+        self.capture = None
+
+    def _fill(self) -> bool:
+        self._buffer = self._file.read(self._chunk_size)
+        self._pos = 0
+        return len(self._buffer) > 0
+
+    def advance(self, size: int) -> None:
+        if self.capture is not None:
+            self.capture.extend(self._buffer[self._pos:self._pos + size])
+        self._pos += size
+
+    def peek(self) -> int:
+        # next significant byte without consuming it
+        while True:
+            if self._pos >= len(self._buffer) and not self._fill():
+                raise ValueError("Unexpected end of JSON")
+            c = self._buffer[self._pos]
+            if c not in WHITESPACE:
+                return c
+            self.advance(1)
+
+    def expect(self, c: int) -> None:
+        if self.peek() != c:
+            raise ValueError("Expected '{:s}' in JSON".format(chr(c)))
+        self.advance(1)
+
+    def string(self, keep: bool = False) -> bytes|None:
+        # consume a string and return its raw contents (without quotes) if requested
+        self.expect(QUOTE)
+        data = bytearray() if keep else None
+        escaped = False
+        while True:
+            if self._pos >= len(self._buffer) and not self._fill():
+                raise ValueError("Unterminated JSON string")
+            buf = self._buffer
+            start = self._pos + 1 if escaped else self._pos  # skip a character escaped at the end of the previous chunk
+            quote = buf.find(b'"', start)
+            end = len(buf) if quote < 0 else quote
+
+            # an odd run of backslashes escapes the following character
+            backslashes = 0
+            while end - backslashes > start and buf[end - backslashes - 1] == BACKSLASH:
+                backslashes += 1
+            escaped = backslashes % 2 == 1
+
+            if quote < 0:
+                if data is not None:
+                    data.extend(buf[self._pos:])
+                self.advance(len(buf) - self._pos)
+            else:
+                if data is not None:
+                    data.extend(buf[self._pos:quote + 1 if escaped else quote])
+                self.advance(quote + 1 - self._pos)
+                if not escaped:
+                    return bytes(data) if data is not None else None
+                escaped = False
+
+    def skip(self) -> None:
+        # consume a value of any type
+        c = self.peek()
+        if c == QUOTE:
+            self.string()
+        elif c in OPENERS:
+            depth = 0
+            while True:
+                c = self.peek()
+                if c == QUOTE:
+                    self.string()
+                    continue
+                self.advance(1)
+                if c in OPENERS:
+                    depth += 1
+                elif c in CLOSERS:
+                    depth -= 1
+                    if not depth:
+                        return
+        else:
+            while self._pos < len(self._buffer) or self._fill():
+                if self._buffer[self._pos] in DELIMITERS:
+                    return
+                self.advance(1)
+
+
+def _decode(data: bytes) -> str:
+    if data.find(b"\\") < 0:
+        return str(data, "utf-8")
+    return json.loads('"' + str(data, "utf-8") + '"')
+
+
+def _value(stream: _Stream, fields):
+    c = stream.peek()
+    if isinstance(fields, dict) and c == LBRACE:
+        return _object(stream, fields)
+    if isinstance(fields, list) and c == LBRACKET:
+        return _array(stream, fields[0])
+
+    # keep the entire value, including those which don't have the expected shape (ie: null)
+    if c == QUOTE:
+        return _decode(stream.string(True))
+    stream.capture = bytearray()
+    try:
+        stream.skip()
+        data = stream.capture
+    finally:
+        stream.capture = None
+    return json.loads(str(data, "utf-8"))
+
+
+def _object(stream: _Stream, fields: dict, complete: bool = True) -> dict:
+    result = {}
+    stream.expect(LBRACE)
+    if stream.peek() == RBRACE:
+        stream.advance(1)
+        return result
+    while True:
+        key = _decode(stream.string(True))
+        stream.expect(COLON)
+        if key in fields:
+            result[key] = _value(stream, fields[key])
+            # the rest of the document doesn't need to be read once every field is found
+            if not complete and len(result) == len(fields):
+                return result
+        else:
+            stream.skip()
+        c = stream.peek()
+        stream.advance(1)
+        if c == RBRACE:
+            return result
+        if c != COMMA:
+            raise ValueError("Expected ',' or '}' in JSON")
+
+
+def _array(stream: _Stream, fields) -> list:
+    result = []
+    stream.expect(LBRACKET)
+    if stream.peek() == RBRACKET:
+        stream.advance(1)
+        return result
+    while True:
+        result.append(_value(stream, fields))
+        c = stream.peek()
+        stream.advance(1)
+        if c == RBRACKET:
+            return result
+        if c != COMMA:
+            raise ValueError("Expected ',' or ']' in JSON")
+
+
+def load(file_obj, fields, chunk_size: int = CHUNK_SIZE):
+    """Read only the selected fields of a JSON document from a binary file object
+    (or HTTPStream) without loading the entire document into memory. The result has
+    the same structure as the document, limited to the selected fields. Reading
+    stops as soon as every top-level field has been found."""
+    stream = _Stream(file_obj, chunk_size)
+    if isinstance(fields, dict) and stream.peek() == LBRACE:
+        return _object(stream, fields, False)
+    return _value(stream, fields)
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import struct
+from array import array
+
+import displayio
+
+try:
+    from bitmaptools import readinto as _bitmap_readinto
+except ImportError:
+    _bitmap_readinto = None
+
+try:
+    from bitmaptools import blit as _bitmap_blit
+except ImportError:
+    _bitmap_blit = None
+
+# Constants
+MAGIC = b"FJRI"
+TRANSPARENT = 0x1000000
+
+# Raw image structures
+#
+# header:  magic, width, height, bits per pixel, palette size (0 for RGB565 pixels)
+# palette: color of each entry with TRANSPARENT set if transparent
+# pixels:  one element per pixel in top-down row order, 8-bit indices or native RGB565
+HEADER_STRUCT = "<4sHHBH"
+HEADER_SIZE = struct.calcsize(HEADER_STRUCT)
+COLOR_STRUCT = "<L"
+COLOR_SIZE = struct.calcsize(COLOR_STRUCT)
+
+
+def save(path: str, bitmap: displayio.Bitmap, pixel_shader) -> None:
+    """Write a decoded image in a format which can be read directly into a Bitmap."""
+    palette = isinstance(pixel_shader, displayio.Palette)
+    colors = len(pixel_shader) if palette else 0
+    with open(path, "wb") as f:
+        f.write(struct.pack(HEADER_STRUCT, MAGIC, bitmap.width, bitmap.height, 8 if palette else 16, colors))
+        for i in range(colors):
+            f.write(struct.pack(
+                COLOR_STRUCT,
+                pixel_shader[i] | (TRANSPARENT if pixel_shader.is_transparent(i) else 0)
+            ))
+        if _bitmap_blit:
+            # copy each row into a bitmap of the file's depth, its buffer then holds the row's elements
+            row = displayio.Bitmap(bitmap.width, 1, 256 if palette else 65535)
+            view = memoryview(row)[:bitmap.width]
+            for y in range(bitmap.height):
+                _bitmap_blit(row, bitmap, 0, 0, x1=0, y1=y, x2=bitmap.width, y2=y + 1)
+                f.write(view)
+        else:  # copy each pixel
+            row = array("B" if palette else "H", [0] * bitmap.width)
+            for y in range(bitmap.height):
+                for x in range(bitmap.width):
+                    row[x] = bitmap[x, y]
+                f.write(row)
+
+
+def load(path: str) -> tuple:
+    """Read an image written by save() and return a (Bitmap, Palette or ColorConverter) pair."""
+    with open(path, "rb") as f:
+        data = f.read(HEADER_SIZE)
+        if len(data) != HEADER_SIZE:
+            raise ValueError("Unexpected end of raw image")
+        magic, width, height, bits_per_pixel, colors = struct.unpack(HEADER_STRUCT, data)
+        if magic != MAGIC:
+            raise ValueError("Invalid raw image signature")
+
+        if colors:
+            pixel_shader = displayio.Palette(colors)
+            data = f.read(colors * COLOR_SIZE)
+            for i in range(colors):
+                color = struct.unpack_from(COLOR_STRUCT, data, i * COLOR_SIZE)[0]
+                pixel_shader[i] = color & 0xffffff
+                if color & TRANSPARENT:
+                    pixel_shader.make_transparent(i)
+            bitmap = displayio.Bitmap(width, height, colors)
+        else:
+            pixel_shader = displayio.ColorConverter(input_colorspace=displayio.Colorspace.RGB565)
+            bitmap = displayio.Bitmap(width, height, 65535)
+
+        if _bitmap_readinto:
+            _bitmap_readinto(
+                bitmap,
+                f,
+                bits_per_pixel=bits_per_pixel,
+                element_size=bits_per_pixel // 8,
+            )
+        else:  # use the standard file.readinto
+            row = array("B" if colors else "H", [0] * width)
+            for y in range(height):
+                f.readinto(row)
+                for x in range(width):
+                    bitmap[x, y] = row[x]
+
+    return bitmap, pixel_shader
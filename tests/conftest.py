@@ -0,0 +1,15 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import os
+import sys
+import types
+
+# const() is a builtin of CircuitPython
+sys.modules.setdefault("micropython", types.SimpleNamespace(const=lambda x: x))
+
+# the application's modules are imported from the repository root
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
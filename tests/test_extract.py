@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import ast
+import io
+import os
+import tempfile
+import typing
+import unittest
+import zipfile
+from binascii import crc32
+
+import zipreader
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def load_functions(names, namespace):
+    # code.py runs the application when imported, so only the listed functions are taken from it
+    with open(os.path.join(ROOT, "code.py")) as f:
+        tree = ast.parse(f.read())
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), "code.py", "exec"), namespace)
+    return namespace
+
+
+def run(generator):
+    try:
+        while True:
+            next(generator)
+    except StopIteration as e:
+        return e.value
+
+
+def tree(path):
+    entries = set()
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in dirnames + filenames:
+            entries.add(os.path.relpath(os.path.join(dirpath, name), path))
+    return entries
+
+
+class ExtractTest(unittest.TestCase):
+
+    def setUp(self):
+        self.namespace = load_functions(
+            ("exists", "mkdir", "plan_extraction", "file_matches", "extractall", "extractstream"),
+            {"os": os, "typing": typing, "crc32": crc32, "ZipFile": zipreader.ZipFile, "ZipStream": zipreader.ZipStream,
+             "EXTRACT_CHUNK_SIZE": 4096, "VERSION_DIR": "CircuitPython 10.x"},
+        )
+        self.sources = ("app/CircuitPython 10.x", "CircuitPython 10.x", "app", "")
+
+    def temporary_directory(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
+
+    def extract(self, files):
+        data = io.BytesIO()
+        with zipfile.ZipFile(data, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, contents in files:
+                zf.writestr(name, contents)
+
+        # streamed as the archive arrives
+        streamed = self.temporary_directory()
+        stream = zipreader.ZipStream(io.BytesIO(data.getvalue()))
+        paths, written, total = run(self.namespace["extractstream"](stream, streamed + "/app", self.sources))
+
+        # from the central directory with the source chosen like open_release
+        ranged = self.temporary_directory()
+        zf = zipreader.ZipFile(io.BytesIO(data.getvalue()), compact=True)
+        source = next(filter(lambda dirpath: (dirpath + "/code.py").strip("/") in zf, self.sources))
+        run(self.namespace["extractall"](zf, ranged + "/app", source))
+
+        self.assertEqual(tree(streamed), tree(ranged))
+        return paths, written
+
+    def test_versions(self):
+        paths, written = self.extract((
+            ("app/README.txt", "readme"),
+            ("app/docs/guide/index.txt", "guide"),
+            ("app/CircuitPython 9.x/code.py", "old"),
+            ("app/CircuitPython 9.x/lib/old/module.py", "old"),
+            ("app/CircuitPython 10.x/code.py", "new"),
+            ("app/CircuitPython 10.x/lib/new/module.py", "new"),
+            ("app/CircuitPython 11.x/code.py", "newer"),
+        ))
+        self.assertEqual(paths, {"code.py", "lib/new/module.py"})
+        self.assertEqual(written, 2)
+
+    def test_root(self):
+        paths, written = self.extract((
+            ("app/lib/module.py", "lib"),
+            ("app/code.py", "code"),
+            ("README.txt", "readme"),
+        ))
+        self.assertEqual(paths, {"code.py", "lib/module.py"})
+
+
+if __name__ == "__main__":
+    unittest.main()
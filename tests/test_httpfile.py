@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import socket
+import threading
+import unittest
+
+try:
+    import adafruit_requests
+except ImportError:
+    adafruit_requests = None
+else:
+    import httpfile
+
+
+class RequestLineServer:
+    """Records the request line of each request without normalizing it like http.server."""
+
+    def __init__(self):
+        self.lines = []
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(8)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self.sock.close()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, address = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        data = b""
+        with connection:
+            while True:
+                while b"\r\n\r\n" not in data:
+                    chunk = connection.recv(1024)
+                    if not chunk:
+                        return
+                    data += chunk
+                head, data = data.split(b"\r\n\r\n", 1)
+                self.lines.append(str(head.split(b"\r\n", 1)[0], "utf-8"))
+                connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+
+
+@unittest.skipIf(adafruit_requests is None, "adafruit_requests is not installed")
+class FetchAllTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = RequestLineServer()
+        self.addCleanup(self.server.close)
+        self.session = adafruit_requests.Session(socket, None, session_id="test")
+        self.base = "http://127.0.0.1:{:d}".format(self.server.port)
+
+    def fetch(self, urls):
+        received = {}
+        for result in httpfile.fetch_all(self.session, [(url, None) for url in urls]):
+            if result is not None:
+                index, response = result
+                received[index] = response.content
+        return received
+
+    def test_request_line(self):
+        urls = [self.base + "/repos/a/b", self.base + "/a file.json", self.base]
+        for url in urls:
+            response = self.session.get(url)
+            response.close()
+        expected = list(self.server.lines)
+        self.server.lines.clear()
+
+        self.assertEqual(self.fetch(urls), {0: b"ok", 1: b"ok", 2: b"ok"})
+        self.assertEqual(sorted(self.server.lines), sorted(expected))
+        self.assertIn("GET /repos/a/b HTTP/1.1", self.server.lines)
+        self.assertIn("GET /a%20file.json HTTP/1.1", self.server.lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2026 Cooper Dalrymple (@relic-se)
+#
+# SPDX-License-Identifier: GPLv3
+
+import io
+import os
+import random
+import unittest
+import zipfile
+import zlib
+
+import zipreader
+
+
+class ChunkedFile(io.BytesIO):
+    """Returns short reads like an HTTPRangeFile at its buffer boundaries."""
+
+    def __init__(self, data, chunk_size):
+        super().__init__(data)
+        self.chunk_size = chunk_size
+
+    def readinto(self, buf):
+        view = memoryview(buf)
+        return super().readinto(view[:min(len(view), self.chunk_size - self.tell() % self.chunk_size)])
+
+
+def build_archive(count):
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(count):
+            zf.writestr("app/CircuitPython 10.x/lib/module_{:03d}.py".format(i), "value = {:d}\n".format(i) * 8)
+    return data.getvalue()
+
+
+def sample_files():
+    rng = random.Random(1)
+    text = b"".join(b"line %d of a module\n" % rng.randrange(50) for i in range(8000))
+    noise = bytes(rng.randrange(256) for i in range(70000))
+    return {
+        "empty.txt": b"",
+        "small.py": b"print('hello')\n" * 20,
+        "text.py": text,  # dynamic huffman blocks with long matches across the window
+        "noise.bin": noise,  # stored blocks
+    }
+
+
+def build_members(files, compression):
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w", compression) as zf:
+        for name, contents in files.items():
+            zf.writestr(name, contents)
+    return data.getvalue()
+
+
+class BytesWriter:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, buf):
+        self.data.extend(buf)
+        return len(buf)
+
+
+class ZipFileTest(unittest.TestCase):
+
+    def test_compact_short_reads(self):
+        data = build_archive(200)
+        for chunk_size in (1000, 37):
+            with self.subTest(chunk_size=chunk_size):
+                zf = zipreader.ZipFile(ChunkedFile(data, chunk_size), compact=True)
+                self.assertEqual(len(zf), 200)
+                name = "app/CircuitPython 10.x/lib/module_123.py"
+                self.assertEqual(zf[name].size, len("value = 123\n") * 8)
+                self.assertEqual(bytes(zf.read(name)), b"value = 123\n" * 8)
+
+    def test_compact_truncated(self):
+        data = build_archive(20)
+        # drop the second half of the central directory while keeping the end record
+        end = data.rindex(b"PK\x05\x06")
+        start = data.index(b"PK\x01\x02")
+        truncated = data[:(start + end) // 2]
+        zf = zipreader.ZipFile.__new__(zipreader.ZipFile)
+        zf.file_obj = ChunkedFile(truncated, 1000)
+        zf.file_obj.seek(start)
+        with self.assertRaises(zipreader.BadZipFile):
+            zf._read_compact(20)
+
+
+    def test_members(self):
+        files = sample_files()
+        for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            data = build_members(files, compression)
+            for compact in (False, True):
+                with self.subTest(compression=compression, compact=compact):
+                    zf = zipreader.ZipFile(ChunkedFile(data, 1000), compact=compact)
+                    for name, contents in files.items():
+                        # small reads through readinto
+                        with zf.open(name) as f:
+                            buf = bytearray(100)
+                            received = bytearray()
+                            while size := f.readinto(buf):
+                                received.extend(buf[:size])
+                        self.assertEqual(bytes(received), contents)
+
+                        writer = BytesWriter()
+                        self.assertEqual(zf.extract_to(name, writer, bytearray(512)), len(contents))
+                        self.assertEqual(bytes(writer.data), contents)
+
+    def test_bad_crc(self):
+        data = bytearray(build_members({"a.txt": b"abc" * 100}, zipfile.ZIP_STORED))
+        data[data.index(b"abc")] = ord("x")
+        zf = zipreader.ZipFile(io.BytesIO(data))
+        with self.assertRaises(zipreader.BadZipFile):
+            zf.read("a.txt")
+
+
+class InflateTest(unittest.TestCase):
+    """Members are inflated in Python when zlib can't stream, as on CircuitPython."""
+
+    def setUp(self):
+        self.zlib = zipreader.decompressobj, zipreader.DecompIO
+        zipreader.decompressobj = zipreader.DecompIO = None
+
+    def tearDown(self):
+        zipreader.decompressobj, zipreader.DecompIO = self.zlib
+
+    def test_members(self):
+        files = sample_files()
+        data = build_members(files, zipfile.ZIP_DEFLATED)
+        zf = zipreader.ZipFile(ChunkedFile(data, 1000), compact=True)
+        for name, contents in files.items():
+            with self.subTest(name=name):
+                with zf.open(name) as f:
+                    self.assertEqual(isinstance(f._decomp, zipreader._InflateIO), len(contents) > zipreader.INFLATE_SIZE)
+                writer = BytesWriter()
+                self.assertEqual(zf.extract_to(name, writer), len(contents))
+                self.assertEqual(bytes(writer.data), contents)
+
+    def test_block_types(self):
+        contents = sample_files()["text.py"] + sample_files()["noise.bin"][:5000]
+        for strategy in (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FIXED, zlib.Z_HUFFMAN_ONLY, zlib.Z_RLE):
+            for level in (0, 1, 9):
+                with self.subTest(strategy=strategy, level=level):
+                    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 8, strategy)
+                    data = compressor.compress(contents) + compressor.flush()
+                    inflater = zipreader._InflateIO(ChunkedFile(data + b"next member", 777), len(data))
+                    received = bytearray()
+                    buf = bytearray(3000)
+                    while size := inflater.readinto(buf):
+                        received.extend(buf[:size])
+                    self.assertEqual(bytes(received), contents)
+                    self.assertEqual(inflater.left, 0)
+
+    def test_stream_skip(self):
+        # unread members are skipped without inflating them
+        files = sample_files()
+        stream = zipreader.ZipStream(ChunkedFile(build_members(files, zipfile.ZIP_DEFLATED), 1000))
+        names = []
+        for member in stream:
+            names.append(member.zip_info.name)
+            if member.zip_info.name == "small.py":
+                self.assertEqual(bytes(member.read()), files["small.py"])
+        self.assertEqual(names, list(files))
+
+    def test_truncated(self):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        data = compressor.compress(sample_files()["text.py"]) + compressor.flush()
+        inflater = zipreader._InflateIO(io.BytesIO(data[:len(data) // 2]), len(data))
+        with self.assertRaises(zipreader.BadZipFile):
+            while inflater.readinto(bytearray(4096)):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,728 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import struct
+from micropython import const
+from array import array
+from binascii import crc32
+from collections import OrderedDict
+from zlib import decompress
+
+# Subclassing IOBase lets DecompIO read from ZipStream
+try:
+    from io import IOBase
+except ImportError:
+    IOBase = object
+
+try:
+    from zlib import decompressobj
+except ImportError:
+    decompressobj = None
+
+try:
+    from zlib import DecompIO
+except ImportError:
+    DecompIO = None
+
+# Constants
+SEEK_SET = const(0)
+SEEK_CUR = const(1)
+SEEK_END = const(2)
+ZIP_WBITS = const(-15)
+COMP_NONE = const(0)
+COMP_DEF = const(8)
+CHUNK_SIZE = const(4096)
+WINDOW_SIZE = const(32768)  # Deflate history
+INFLATE_SIZE = const(32768)  # Larger members are inflated by _InflateIO without a streaming zlib
+FLAG_DATA_DESCRIPTOR = const(0x08)
+
+# ZIP structures
+EOCD_SIG = b'PK\x05\x06'
+EOCD_STRUCT = '<4s4H2LH'
+EOCD_SIZE = struct.calcsize(EOCD_STRUCT)
+CD_F_H_SIG = b'PK\x01\x02'
+CD_F_H_STRUCT = '<4s4B4H3L5H2L'
+CD_F_H_SIZE = struct.calcsize(CD_F_H_STRUCT)
+LOCAL_F_H_SIG = b'PK\x03\x04'
+LOCAL_F_H_STRUCT = '<4s2B4HL2L2H'
+LOCAL_F_H_SIZE = struct.calcsize(LOCAL_F_H_STRUCT)
+DD_SIG = b'PK\x07\x08'
+DD_STRUCT = '<3L'
+DD_SIZE = struct.calcsize(DD_STRUCT)
+
+# Deflate code tables (RFC 1951)
+LENGTH_BASE = (3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31,
+               35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258)
+LENGTH_EXTRA = (0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2,
+                3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0)
+DIST_BASE = (1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193,
+             257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145,
+             8193, 12289, 16385, 24577)
+DIST_EXTRA = (0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6,
+              7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13)
+CODE_LENGTH_ORDER = (16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2,
+                     14, 1, 15)
+
+
+class BadZipFile(Exception):
+    pass
+
+
+def _huffman(lengths):
+    # Canonical Huffman code as (count of codes per length, symbols in code order)
+    counts = [0] * 16
+    for length in lengths:
+        counts[length] += 1
+    counts[0] = 0
+    offsets = [0] * 16
+    for length in range(1, 15):
+        offsets[length + 1] = offsets[length] + counts[length]
+    symbols = [0] * len(lengths)
+    for symbol, length in enumerate(lengths):
+        if length:
+            symbols[offsets[length]] = symbol
+            offsets[length] += 1
+    return counts, symbols
+
+
+_fixed = None
+
+
+class _InflateIO:
+    """Streaming inflater in Python for ports whose zlib only provides
+    decompress() (ie: CircuitPython). Reads exactly size bytes of raw deflate
+    data from file_obj and keeps memory use to the 32KB history window, but
+    it's much slower than zlib so it's only used for large members."""
+
+    def __init__(self, file_obj, size):
+        self.file_obj = file_obj
+        self.left = size  # compressed bytes not yet read from file_obj
+        self._input = bytearray(256)
+        self._input_pos = 0
+        self._input_len = 0
+        self._bits = 0
+        self._bit_count = 0
+        self._window = bytearray(WINDOW_SIZE)
+        self._written = 0  # total bytes inflated into the window
+        self._returned = 0  # total bytes returned by readinto
+        self._inflater = self._inflate()
+
+    def readinto(self, buf):
+        while self._written == self._returned:
+            if self._inflater is None:
+                return 0
+            try:
+                next(self._inflater)
+            except StopIteration:
+                self._inflater = None
+        start = self._returned % WINDOW_SIZE
+        size = min(len(buf), self._written - self._returned, WINDOW_SIZE - start)
+        buf[:size] = memoryview(self._window)[start:start + size]
+        self._returned += size
+        return size
+
+    def _byte(self):
+        if self._input_pos >= self._input_len:
+            size = min(len(self._input), self.left)
+            if size:
+                size = self.file_obj.readinto(memoryview(self._input)[:size])
+            if not size:
+                raise BadZipFile("Unexpected end of deflate data")
+            self.left -= size
+            self._input_len = size
+            self._input_pos = 0
+        self._input_pos += 1
+        return self._input[self._input_pos - 1]
+
+    def _need(self, count):
+        bits, bit_count = self._bits, self._bit_count
+        while bit_count < count:
+            bits |= self._byte() << bit_count
+            bit_count += 8
+        self._bits, self._bit_count = bits >> count, bit_count - count
+        return bits & ((1 << count) - 1)
+
+    def _decode(self, code_table):
+        counts, symbols = code_table
+        bits, bit_count = self._bits, self._bit_count
+        code = first = index = 0
+        for length in range(1, 16):
+            if not bit_count:
+                bits, bit_count = self._byte(), 8
+            code |= bits & 1
+            bits >>= 1
+            bit_count -= 1
+            count = counts[length]
+            if code - count < first:
+                self._bits, self._bit_count = bits, bit_count
+                return symbols[index + code - first]
+            index += count
+            first = (first + count) << 1
+            code <<= 1
+        raise BadZipFile("Invalid deflate code")
+
+    def _dynamic(self):
+        literal_count = self._need(5) + 257
+        dist_count = self._need(5) + 1
+        code_count = self._need(4) + 4
+        lengths = [0] * 19
+        for i in range(code_count):
+            lengths[CODE_LENGTH_ORDER[i]] = self._need(3)
+        code_table = _huffman(lengths)
+        lengths = []
+        while len(lengths) < literal_count + dist_count:
+            symbol = self._decode(code_table)
+            if symbol < 16:
+                lengths.append(symbol)
+            elif symbol == 16:
+                if not lengths:
+                    raise BadZipFile("Invalid deflate code lengths")
+                lengths.extend([lengths[-1]] * (3 + self._need(2)))
+            elif symbol == 17:
+                lengths.extend([0] * (3 + self._need(3)))
+            else:
+                lengths.extend([0] * (11 + self._need(7)))
+        if len(lengths) != literal_count + dist_count:
+            raise BadZipFile("Invalid deflate code lengths")
+        return _huffman(lengths[:literal_count]), _huffman(lengths[literal_count:])
+
+    def _inflate(self):
+        # Generator which inflates into the window, pausing whenever a chunk is ready to be returned
+        global _fixed
+        window = self._window
+        written = 0
+        final = 0
+        while not final:
+            final = self._need(1)
+            block_type = self._need(2)
+            if block_type == 0:
+                # Stored block, starting at the next byte
+                self._bits = self._bit_count = 0
+                length = self._need(16)
+                if self._need(16) != length ^ 0xffff:
+                    raise BadZipFile("Invalid stored block length")
+                for i in range(length):
+                    window[written % WINDOW_SIZE] = self._byte()
+                    written += 1
+                    if written - self._returned >= CHUNK_SIZE:
+                        self._written = written
+                        yield
+                continue
+            if block_type == 1:
+                if _fixed is None:
+                    _fixed = (_huffman([8] * 144 + [9] * 112 + [7] * 24 + [8] * 8),
+                              _huffman([5] * 30))
+                literals, distances = _fixed
+            elif block_type == 2:
+                literals, distances = self._dynamic()
+            else:
+                raise BadZipFile("Invalid deflate block type")
+            while True:
+                symbol = self._decode(literals)
+                if symbol < 256:
+                    window[written % WINDOW_SIZE] = symbol
+                    written += 1
+                elif symbol == 256:
+                    break
+                else:
+                    symbol -= 257
+                    if symbol >= 29:
+                        raise BadZipFile("Invalid deflate length")
+                    length = LENGTH_BASE[symbol] + self._need(LENGTH_EXTRA[symbol])
+                    symbol = self._decode(distances)
+                    if symbol >= 30:
+                        raise BadZipFile("Invalid deflate distance")
+                    distance = DIST_BASE[symbol] + self._need(DIST_EXTRA[symbol])
+                    if distance > written:
+                        raise BadZipFile("Deflate distance too far back")
+                    start = (written - distance) % WINDOW_SIZE
+                    end = written % WINDOW_SIZE
+                    if distance >= length and start + length <= WINDOW_SIZE and end + length <= WINDOW_SIZE:
+                        window[end:end + length] = window[start:start + length]
+                        written += length
+                    else:
+                        for i in range(length):
+                            window[written % WINDOW_SIZE] = window[(written - distance) % WINDOW_SIZE]
+                            written += 1
+                if written - self._returned >= CHUNK_SIZE:
+                    self._written = written
+                    yield
+        self._written = written
+
+
+class ZipInfo:
+    def __init__(self, header_data, local=False):
+        self.name = ''  # Overriden by ZipFile
+        if header_data is None:
+            return  # Fields assigned by ZipFile in compact mode
+        if local:
+            (sig,
+             _, _,  # Min version, we don't care
+             self.flags,
+             self.compress_method,
+             self.last_mod_time,
+             self.last_mod_date,
+             self.crc32,
+             self.compressed_size,
+             self.size,
+             self.filename_len,
+             self.extra_field_len) = struct.unpack(LOCAL_F_H_STRUCT, header_data)
+            self.comment_len = 0
+            self.offset = None  # Unknown while streaming
+            if sig != LOCAL_F_H_SIG:
+                raise BadZipFile(
+                    "Local file header signature mismatch, ZIP corrupt?")
+            return
+
+        (sig,
+         _, _, _, _,  # Compressor and min version, we don't care
+         self.flags,
+         self.compress_method,
+         self.last_mod_time,
+         self.last_mod_date,
+         self.crc32,
+         self.compressed_size,
+         self.size,
+         self.filename_len,
+         self.extra_field_len,
+         self.comment_len,
+         _,  # Disk number, we only support single part ZIPs
+         _, _,  # File attributes, we don't care
+         self.offset) = struct.unpack(CD_F_H_STRUCT, header_data)
+        if sig != CD_F_H_SIG:
+            raise BadZipFile(
+                "Central directory entry signature mismatch, ZIP corrupt?")
+
+    @property
+    def streamed(self):
+        # Sizes and CRC32 follow the data in a data descriptor
+        return bool(self.flags & FLAG_DATA_DESCRIPTOR) and not self.compressed_size
+
+    @property
+    def compressed(self):
+        return self.compress_method != COMP_NONE
+
+    def __str__(self):
+        return "<{} name={}, compressed={}, size={}, offset={}>".format(
+            self.__class__.__name__,
+            self.name,
+            self.compressed,
+            self.size,
+            self.offset)
+
+
+class ZipExtFile:
+    """Read-only stream of a single archive member. Data is inflated in chunks
+    no larger than the shared buffer and the CRC32 is validated once the member
+    has been read to the end, so memory use doesn't depend on the member size."""
+
+    def __init__(self, file_obj, zip_info, buffer, seek=True):
+        self.file_obj = file_obj
+        self.zip_info = zip_info
+        self.crc = 0
+        self._buffer = buffer
+        self._pos = 0
+        self._eof = False
+        self._decomp = None
+        self._pending = b''
+        self._pending_offset = 0
+
+        # Streamed members have unknown sizes until the data descriptor
+        if zip_info.streamed:
+            if zip_info.compress_method != COMP_DEF or decompressobj is None:
+                raise BadZipFile("Can't determine the size of streamed "
+                                 "file {}".format(zip_info.name))
+            self._left = self._compress_left = None
+        else:
+            self._left = zip_info.size  # uncompressed bytes not yet returned
+            self._compress_left = zip_info.compressed_size
+
+        # Skip local file header, name and extra field may differ from central directory
+        if seek:
+            file_obj.seek(zip_info.offset)
+            header = struct.unpack(LOCAL_F_H_STRUCT, file_obj.read(LOCAL_F_H_SIZE))
+            if header[0] != LOCAL_F_H_SIG:
+                raise BadZipFile(
+                    "Local file header signature mismatch, ZIP corrupt?")
+            file_obj.seek(header[-2] + header[-1], SEEK_CUR)
+
+        if zip_info.compress_method == COMP_DEF:
+            # DecompIO is slow, but still preferred over holding the whole member
+            if decompressobj is not None:
+                self._decomp = decompressobj(ZIP_WBITS)
+            elif DecompIO is not None:
+                self._decomp = DecompIO(file_obj, ZIP_WBITS)
+            elif zip_info.size > INFLATE_SIZE:
+                # No streaming zlib (CircuitPython), inflate in Python rather than holding a large member
+                self._decomp = _InflateIO(file_obj, self._compress_left)
+            else:
+                # Small members are decompressed in one shot which is much faster
+                self._pending = decompress(
+                    file_obj.read(self._compress_left), ZIP_WBITS)
+                self._compress_left = 0
+        elif zip_info.compress_method != COMP_NONE:
+            raise BadZipFile("Unsupported compression method"
+                             "for file {}".format(zip_info.name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._decomp = None
+        self._pending = b''
+
+    def tell(self):
+        return self._pos
+
+    def _fill(self):
+        # Inflate the next chunk of compressed data (decompressobj only)
+        decomp = self._decomp
+        data = decomp.unconsumed_tail
+        if not data and self._compress_left != 0:
+            size = len(self._buffer)
+            if self._compress_left is not None:
+                size = min(size, self._compress_left)
+            size = self.file_obj.readinto(memoryview(self._buffer)[:size])
+            if not size:
+                raise BadZipFile(
+                    "Unexpected end of data for file {}".format(
+                        self.zip_info.name))
+            if self._compress_left is not None:
+                self._compress_left -= size
+            data = memoryview(self._buffer)[:size]
+        self._pending = decomp.decompress(data, len(self._buffer))
+        self._pending_offset = 0
+        if self._left is None and decomp.eof:
+            # Hand back anything read past the end of the deflate stream
+            self._eof = True
+            if decomp.unused_data:
+                self.file_obj.unread(decomp.unused_data)
+        elif (not self._pending and self._compress_left == 0
+                and not decomp.unconsumed_tail):
+            raise BadZipFile(
+                "Truncated data for file {}".format(self.zip_info.name))
+
+    def readinto(self, buf):
+        size = len(buf) if self._left is None else min(len(buf), self._left)
+        if not size:
+            return 0
+        buf = memoryview(buf)[:size]
+
+        if self._decomp is not None and decompressobj is not None:
+            while self._pending_offset >= len(self._pending):
+                if self._eof:
+                    return 0
+                self._fill()
+
+        if self._pending_offset < len(self._pending):
+            size = min(size, len(self._pending) - self._pending_offset)
+            buf[:size] = memoryview(self._pending)[
+                self._pending_offset:self._pending_offset + size]
+            self._pending_offset += size
+        elif self._decomp is None:
+            size = self.file_obj.readinto(buf)
+            self._compress_left -= size
+        else:
+            size = self._decomp.readinto(buf)
+        if not size:
+            raise BadZipFile(
+                "Unexpected end of data for file {}".format(
+                    self.zip_info.name))
+
+        # Validate CRC32 once all data has been read
+        self.crc = crc32(buf[:size], self.crc)
+        self._pos += size
+        if self._left is not None:
+            self._left -= size
+            if not self._left and self.crc != self.zip_info.crc32:
+                raise BadZipFile(
+                    "Bad CRC32 for file {}".format(self.zip_info.name))
+        return size
+
+    def read(self, size=-1):
+        if self._left is None:
+            data = bytearray()
+            while size < 0 or len(data) < size:
+                chunk = bytearray(len(self._buffer) if size < 0
+                                  else size - len(data))
+                chunk_size = self.readinto(chunk)
+                if not chunk_size:
+                    break
+                data.extend(memoryview(chunk)[:chunk_size])
+            return data
+
+        if size < 0 or size > self._left:
+            size = self._left
+        data = bytearray(size)
+        view = memoryview(data)
+        pos = 0
+        while pos < size:
+            pos += self.readinto(view[pos:])
+        return data
+
+    def skip(self):
+        # Discard the rest of the member, without inflating it when the compressed size is known
+        if isinstance(self._decomp, _InflateIO):
+            self._compress_left = self._decomp.left
+            self._decomp = None
+        if self._compress_left is None or (
+                self._decomp is not None and decompressobj is None):
+            buf = bytearray(len(self._buffer))
+            while self.readinto(buf):
+                pass
+            return
+        while self._compress_left:
+            size = self.file_obj.readinto(memoryview(self._buffer)[
+                :min(len(self._buffer), self._compress_left)])
+            if not size:
+                raise BadZipFile(
+                    "Unexpected end of data for file {}".format(
+                        self.zip_info.name))
+            self._compress_left -= size
+        self._left = 0
+        self._pending = b''
+
+
+class ZipStream(IOBase):
+    """Sequential reader for an archive which can't seek, ie: an HTTP response.
+    Members are parsed from their local file headers as the data arrives, so
+    they can only be read in archive order while iterating."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._buffer = bytearray(CHUNK_SIZE)
+        self._pushback = b''
+
+    def unread(self, data):
+        self._pushback = bytes(data) + self._pushback
+
+    def readinto(self, buf):
+        if self._pushback:
+            size = min(len(buf), len(self._pushback))
+            memoryview(buf)[:size] = self._pushback[:size]
+            self._pushback = self._pushback[size:]
+            return size
+        return self.stream.readinto(buf)
+
+    def read(self, size):
+        data = bytearray(size)
+        view = memoryview(data)
+        pos = 0
+        while pos < size:
+            chunk_size = self.readinto(view[pos:])
+            if not chunk_size:
+                return data[:pos]
+            pos += chunk_size
+        return data
+
+    def _skip(self, size):
+        while size:
+            chunk_size = self.readinto(
+                memoryview(self._buffer)[:min(len(self._buffer), size)])
+            if not chunk_size:
+                raise BadZipFile("Unexpected end of archive")
+            size -= chunk_size
+
+    def __iter__(self):
+        # Yields a ZipExtFile per member, which is skipped if not read to the end
+        while True:
+            header = self.read(LOCAL_F_H_SIZE)
+            if bytes(header[:4]) != LOCAL_F_H_SIG:
+                return  # Reached central directory
+            zi = ZipInfo(header, local=True)
+            zi.name = bytes(self.read(zi.filename_len)).decode()
+            self._skip(zi.extra_field_len)
+
+            member = ZipExtFile(self, zi, self._buffer, seek=False)
+            yield member
+            member.skip()
+
+            if zi.flags & FLAG_DATA_DESCRIPTOR:
+                data = self.read(4)
+                if bytes(data) == DD_SIG:
+                    data = self.read(DD_SIZE)
+                else:
+                    data += self.read(DD_SIZE - 4)
+                crc, compressed_size, size = struct.unpack(DD_STRUCT, data)
+                if zi.streamed and (crc != member.crc
+                                    or size != member.tell()):
+                    raise BadZipFile(
+                        "Bad CRC32 for file {}".format(zi.name))
+
+
+class ZipFile:
+    """Random access reader for an archive on a seekable file object. With
+    compact=True the central directory is kept in parallel arrays and a
+    single blob of encoded names instead of a ZipInfo per entry, which
+    saves a lot of memory on archives with thousands of entries. ZipInfo
+    objects and decoded names are then only created when requested."""
+
+    def __init__(self, file_obj, compact=False):
+        self.file_obj = file_obj
+        self.compact = compact
+        self._buffer = None
+        file_obj.seek(-EOCD_SIZE, SEEK_END)
+        (magic_number,
+         num_disks,
+         _, _,  # Per disk stuff, we don't care
+         central_dir_count,
+         central_dir_size,
+         central_dir_offset,
+         comment_len) = struct.unpack(EOCD_STRUCT, file_obj.read(EOCD_SIZE))
+
+        if magic_number != EOCD_SIG:
+            raise BadZipFile(
+                "EOCD contains comment or ZIP corrupt?")
+        if num_disks:
+            raise BadZipFile(
+                "Multipart/disk ZIPs not supported")
+
+        file_obj.seek(central_dir_offset)
+        if compact:
+            self._read_compact(central_dir_count)
+            return
+
+        self.entries = OrderedDict()
+        for i in range(central_dir_count):
+            zi = ZipInfo(file_obj.read(CD_F_H_SIZE))
+            zi.name = file_obj.read(zi.filename_len).decode()
+            self.entries[zi.name] = zi
+
+            # Skip to next entry
+            file_obj.seek(zi.extra_field_len + zi.comment_len, SEEK_CUR)
+
+    def _readinto_full(self, buf):
+        # Reads may return less than requested, ie: at the chunk boundaries of an HTTP file
+        view = memoryview(buf)
+        pos = 0
+        while pos < len(buf):
+            size = self.file_obj.readinto(view[pos:])
+            if not size:
+                raise BadZipFile("Unexpected end of central directory")
+            pos += size
+
+    def _read_compact(self, count):
+        self.entries = None
+        self._offsets = array('L')
+        self._compressed_sizes = array('L')
+        self._sizes = array('L')
+        self._crcs = array('L')
+        self._methods = array('B')
+        self._flags = array('H')
+        self._names = bytearray()
+        self._name_offsets = array('L', [0])
+        self._lookup = {}  # Name hash to index, or tuple of indices on collision
+
+        header = bytearray(CD_F_H_SIZE)
+        for i in range(count):
+            self._readinto_full(header)
+            (sig,
+             _, _, _, _,
+             flags,
+             compress_method,
+             _, _,  # Modification time and date, we don't care
+             crc,
+             compressed_size,
+             size,
+             filename_len,
+             extra_field_len,
+             comment_len,
+             _, _, _,
+             offset) = struct.unpack(CD_F_H_STRUCT, header)
+            if sig != CD_F_H_SIG:
+                raise BadZipFile(
+                    "Central directory entry signature mismatch, ZIP corrupt?")
+            name = bytearray(filename_len)
+            self._readinto_full(name)
+
+            self._offsets.append(offset)
+            self._compressed_sizes.append(compressed_size)
+            self._sizes.append(size)
+            self._crcs.append(crc)
+            self._methods.append(compress_method)
+            self._flags.append(flags)
+            self._names.extend(name)
+            self._name_offsets.append(len(self._names))
+
+            key = hash(bytes(name))
+            if key not in self._lookup:
+                self._lookup[key] = i
+            elif isinstance(self._lookup[key], int):
+                self._lookup[key] = (self._lookup[key], i)
+            else:
+                self._lookup[key] += (i,)
+
+            # Skip to next entry
+            self.file_obj.seek(extra_field_len + comment_len, SEEK_CUR)
+
+    def _name(self, i):
+        return self._names[self._name_offsets[i]:self._name_offsets[i + 1]]
+
+    def _index(self, k):
+        name = k.encode()
+        indices = self._lookup.get(hash(name))
+        if indices is None:
+            raise KeyError(k)
+        if isinstance(indices, int):
+            indices = (indices,)
+        for i in indices:
+            if self._name(i) == name:
+                return i
+        raise KeyError(k)
+
+    def __len__(self):
+        if self.compact:
+            return len(self._offsets)
+        return len(self.entries)
+
+    def __iter__(self):
+        if not self.compact:
+            yield from self.entries
+            return
+        for i in range(len(self._offsets)):
+            yield self._name(i).decode()
+
+    def __getitem__(self, k):
+        if not self.compact:
+            return self.entries[k]
+        i = self._index(k)
+        zi = ZipInfo(None)
+        zi.name = k
+        zi.flags = self._flags[i]
+        zi.compress_method = self._methods[i]
+        zi.last_mod_time = zi.last_mod_date = 0
+        zi.crc32 = self._crcs[i]
+        zi.compressed_size = self._compressed_sizes[i]
+        zi.size = self._sizes[i]
+        zi.filename_len = self._name_offsets[i + 1] - self._name_offsets[i]
+        zi.extra_field_len = zi.comment_len = 0
+        zi.offset = self._offsets[i]
+        return zi
+
+    def open(self, member):
+        zip_info = member if isinstance(member, ZipInfo) else self[member]
+        if self._buffer is None:
+            self._buffer = bytearray(CHUNK_SIZE)
+        return ZipExtFile(self.file_obj, zip_info, self._buffer)
+
+    def read(self, member):
+        with self.open(member) as f:
+            return f.read()
+
+    def extract_to(self, member, file_obj, buf=None):
+        """Stream a member into a writable file object in chunks and return
+        the number of bytes written. Pass a bytearray as buf to reuse the same
+        output buffer across members."""
+        if buf is None:
+            buf = bytearray(CHUNK_SIZE)
+        view = memoryview(buf)
+        total = 0
+        with self.open(member) as f:
+            while size := f.readinto(buf):
+                file_obj.write(view[:size])
+                total += size
+        return total